@@ -0,0 +1,71 @@
+import time
+
+import claim_normalizer
+from claim_normalizer import RELATION_GRAMMAR, normalize_claim
+
+# Micro-benchmark for normalize_claim: cost per claim as the
+# grammar grows (synthetic rules that never fire) and as the
+# input text gets longer.
+
+CLAIMS = [
+    "Paris is the capital of France",
+    "Einstein was born in 1879",
+    "Hitler died in Berlin",
+    "Smoking causes cancer",
+    "The Eiffel Tower is taller than Mount Everest",
+    "Einstein worked as a patent clerk",
+    "Bananas are berries",
+    "The sky looks blue because of Rayleigh scattering"
+]
+
+FILLER = "the committee reviewed several reports about regional trade and weather "
+
+REPEATS = 2000
+
+
+def time_per_claim(texts):
+
+    start = time.perf_counter()
+
+    for _ in range(REPEATS):
+        for text in texts:
+            normalize_claim(text)
+
+    return (time.perf_counter() - start) / (REPEATS * len(texts)) * 1e6
+
+
+def use_grammar(grammar):
+
+    rules, index = claim_normalizer._compile_grammar(grammar)
+
+    claim_normalizer._rules = rules
+    claim_normalizer._trigger_index = index
+
+
+if __name__ == "__main__":
+
+    time_per_claim(CLAIMS)  # warm-up
+
+    print("Grammar size vs cost per claim")
+
+    for extra in [0, 100, 1000, 10000]:
+
+        synthetic = [
+            ("synthetic", rf"(.*?) relates{i} to (.*)", [f"relates{i} to"], "pair", None)
+            for i in range(extra)
+        ]
+
+        use_grammar(RELATION_GRAMMAR + synthetic)
+
+        print(f"  {len(RELATION_GRAMMAR) + extra:>6} rules: {time_per_claim(CLAIMS):7.1f} us/claim")
+
+    use_grammar(RELATION_GRAMMAR)
+
+    print("\nText length vs cost per claim")
+
+    for words in [10, 100, 1000]:
+
+        padding = (FILLER * (words // 10)).strip()
+        texts = [padding + " " + claim for claim in CLAIMS[:2]] + [padding]
+
+        print(f"  ~{words:>5} words: {time_per_claim(texts):9.1f} us/claim")
@@ -0,0 +1,124 @@
+import pickle
+import sys
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.model_selection import train_test_split
+
+from data_preprocessing import DATASET_PATH, PREPROCESS_COLUMNS, load_dataset, preprocess_dataset, get_training_sets
+from feature_extraction import build_tfidf_features, build_hashing_features
+
+# Vocabulary TF-IDF vs hashed TF-IDF on the training data:
+# featurizer state size, transform throughput, and flag-head
+# accuracy on the train_models.py split.
+#
+#   python benchmark_featurizers.py [dataset path, default DATASET_PATH]
+
+warnings.filterwarnings("ignore")
+
+FEATURIZERS = {
+    "tfidf 6000, 1-2 grams": lambda texts: build_tfidf_features(texts),
+    "tfidf unlimited, 1-3 grams": lambda texts: build_tfidf_features(
+        texts, max_features=None, ngram_range=(1, 3)
+    ),
+    "hashing 2^20, 1-2 grams": lambda texts: build_hashing_features(texts),
+    "hashing 2^20, 1-3 grams": lambda texts: build_hashing_features(
+        texts, ngram_range=(1, 3)
+    )
+}
+
+
+def load_texts(path=DATASET_PATH):
+
+    df = load_dataset(path, columns=PREPROCESS_COLUMNS)
+
+    X_text, y_h_flag, _, y_b_flag, _ = get_training_sets(preprocess_dataset(df))
+
+    return list(X_text), np.asarray(y_h_flag), np.asarray(y_b_flag)
+
+
+def state_size(featurizer):
+    """
+    (pickled bytes, bytes allocated to unpickle it): what every
+    worker holds when the featurizer is loaded from a pickle.
+    """
+
+    blob = pickle.dumps(featurizer)
+
+    tracemalloc.start()
+    loaded = pickle.loads(blob)
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del loaded
+
+    return len(blob), allocated
+
+
+def throughput(featurizer, texts, min_seconds=1.0):
+
+    rounds = 0
+    start = time.perf_counter()
+
+    while time.perf_counter() - start < min_seconds:
+        featurizer.transform(texts)
+        rounds += 1
+
+    return rounds * len(texts) / (time.perf_counter() - start)
+
+
+def flag_scores(X, y, train_idx, test_idx):
+
+    model = LogisticRegression(max_iter=2000, class_weight="balanced")
+    model.fit(X[train_idx], y[train_idx])
+
+    preds = model.predict(X[test_idx])
+
+    return accuracy_score(y[test_idx], preds), f1_score(y[test_idx], preds, average="weighted")
+
+
+if __name__ == "__main__":
+
+    texts, y_h_flag, y_b_flag = load_texts(sys.argv[1] if len(sys.argv) > 1 else DATASET_PATH)
+
+    # Same split as train_models.py
+    train_idx, test_idx = train_test_split(
+        np.arange(len(texts)),
+        test_size=0.2,
+        random_state=42,
+        stratify=y_h_flag
+    )
+
+    print(f"Rows: {len(texts)}\n")
+    print(
+        f"{'featurizer':<28} {'columns':>9} {'fit s':>6} {'pickle KB':>10} "
+        f"{'loaded KB':>10} {'texts/s':>9} {'h acc':>6} {'h F1':>6} "
+        f"{'b acc':>6} {'b F1':>6}"
+    )
+
+    for name, build in FEATURIZERS.items():
+
+        start = time.perf_counter()
+        featurizer, X = build(texts)
+        fit_seconds = time.perf_counter() - start
+
+        pickled, loaded = state_size(featurizer)
+
+        h_acc, h_f1 = flag_scores(X, y_h_flag, train_idx, test_idx)
+        b_acc, b_f1 = flag_scores(X, y_b_flag, train_idx, test_idx)
+
+        print(
+            f"{name:<28} {X.shape[1]:>9} {fit_seconds:>6.2f} {pickled / 1024:>10.0f} "
+            f"{loaded / 1024:>10.0f} {throughput(featurizer, texts):>9.0f} "
+            f"{h_acc:>6.3f} {h_f1:>6.3f} {b_acc:>6.3f} {b_f1:>6.3f}"
+        )
+
+    print(
+        "\nThe hashing state is one float64 idf per bucket whatever the "
+        "n-gram space;\nserved from model_export it is memory-mapped and "
+        "shared by every worker."
+    )
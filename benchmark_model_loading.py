@@ -0,0 +1,69 @@
+import subprocess
+import sys
+
+# Cold start and resident memory of one fresh worker process,
+# loading the pickles vs the memory-mapped pickle-free export,
+# then scoring one batch.
+
+LOADERS = {
+    "pickle": """
+import joblib
+from fused_scorer import FusedScorer
+tfidf = joblib.load("tfidf_vectorizer.pkl")
+scorer = FusedScorer.from_models(*(joblib.load(f"{n}.pkl") for n in [
+    "hallucination_flag_model", "hallucination_type_model",
+    "bias_flag_model", "bias_type_model"]))
+""",
+    "export": """
+from model_export import load_exported_models
+tfidf, scorer = load_exported_models("model_export")
+"""
+}
+
+PROBE = """
+import time, warnings
+warnings.filterwarnings("ignore")
+start = time.perf_counter()
+{loader}
+loaded = time.perf_counter() - start
+scorer.score(tfidf.transform(["women are bad drivers", "paris is the capital of france"]))
+rss = pss = 0
+with open("/proc/self/status") as f:
+    for line in f:
+        if line.startswith("VmRSS:"):
+            rss = int(line.split()[1])
+try:
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Pss:"):
+                pss = int(line.split()[1])
+except OSError:
+    pass
+print(f"{{loaded * 1000:.0f}} {{rss}} {{pss}}")
+"""
+
+
+def probe(loader):
+
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(loader=loader)],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    load_ms, rss_kb, pss_kb = (int(v) for v in result.stdout.split())
+
+    return load_ms, rss_kb, pss_kb
+
+
+if __name__ == "__main__":
+
+    print(f"{'format':<8} {'load ms':>8} {'RSS MB':>8} {'PSS MB':>8}")
+
+    for name, loader in LOADERS.items():
+
+        runs = [probe(loader) for _ in range(3)]
+        load_ms, rss_kb, pss_kb = min(runs)
+
+        print(f"{name:<8} {load_ms:>8} {rss_kb / 1024:>8.1f} {pss_kb / 1024:>8.1f}")
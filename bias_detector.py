@@ -1,16 +1,30 @@
-def rule_based_bias_check(text: str):
-    text = text.lower()
-
-    bias_patterns = {
-        "gender": ["women are", "men are", "girls are", "boys are"],
-        "social": ["poor people", "rich people", "indian people"],
-        "ethical": ["disabled people", "old people"],
-        "racial": ["black people", "white people"]
-    }
-
-    for bias_type, phrases in bias_patterns.items():
-        for p in phrases:
-            if p in text:
-                return True, bias_type
+from phrase_scanner import register_lexicon, scan
+
+# Phrases match on word boundaries: contracted forms are listed
+# ("women aren't"); "women are not" already matches "women are".
+BIAS_PATTERNS = {
+    "gender": [
+        "women are", "women aren't",
+        "men are", "men aren't",
+        "girls are", "girls aren't",
+        "boys are", "boys aren't"
+    ],
+    "social": ["poor people", "rich people", "indian people"],
+    "ethical": ["disabled people", "old people"],
+    "racial": ["black people", "white people"]
+}
+
+BIAS_LEXICON = register_lexicon("bias", BIAS_PATTERNS)
+
+
+def rule_based_bias_check(text: str, hits=None):
+
+    if hits is None:
+        hits = scan(text)
+
+    bias_type = hits.first(BIAS_LEXICON)
+
+    if bias_type is not None:
+        return True, bias_type
 
     return False, "none"
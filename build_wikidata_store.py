@@ -0,0 +1,144 @@
+import argparse
+import bz2
+import gzip
+import json
+import os
+import sqlite3
+
+from evidence_wikidata import compact_entity
+from wikidata_store import STORE_PROPERTIES, normalize_name
+
+# Rows per INSERT batch.
+BATCH_SIZE = 10000
+
+
+def open_dump(path):
+
+    if path.endswith(".bz2"):
+        return bz2.open(path, "rt", encoding="utf-8")
+
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+
+    return open(path, "r", encoding="utf-8")
+
+
+def iter_entities(path):
+    """
+    Streams entities from a Wikidata JSON dump (one entity per line
+    inside a top-level array) or any JSON-lines subset of one.
+    """
+
+    with open_dump(path) as f:
+
+        for line in f:
+
+            line = line.strip().rstrip(",")
+
+            if not line or line in ("[", "]"):
+                continue
+
+            yield json.loads(line)
+
+
+def slim_entity(entity):
+    """
+    Returns (record, names, popularity) keeping only STORE_PROPERTIES,
+    the English label and English aliases.
+    """
+
+    entity_id = entity["id"]
+
+    record = compact_entity(entity_id, entity)
+    record["claims"] = {
+        property_id: values
+        for property_id, values in record["claims"].items()
+        if property_id in STORE_PROPERTIES
+    }
+
+    names = []
+
+    if record["label"]:
+        names.append((normalize_name(record["label"]), 0))
+
+    for alias in entity.get("aliases", {}).get("en", []):
+        names.append((normalize_name(alias["value"]), 1))
+
+    popularity = len(entity.get("sitelinks", {}))
+
+    return record, names, popularity
+
+
+def build_store(dump_path, store_path):
+
+    if os.path.exists(store_path):
+        os.remove(store_path)
+
+    conn = sqlite3.connect(store_path)
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+
+    conn.execute(
+        "CREATE TABLE entities (id TEXT PRIMARY KEY, record TEXT NOT NULL) WITHOUT ROWID"
+    )
+    conn.execute(
+        "CREATE TABLE names (name TEXT NOT NULL, id TEXT NOT NULL,"
+        " rank INTEGER NOT NULL, popularity INTEGER NOT NULL)"
+    )
+
+    entity_rows = []
+    name_rows = []
+    count = 0
+
+    def flush():
+
+        conn.executemany("INSERT OR REPLACE INTO entities VALUES (?, ?)", entity_rows)
+        conn.executemany("INSERT INTO names VALUES (?, ?, ?, ?)", name_rows)
+        conn.commit()
+
+        entity_rows.clear()
+        name_rows.clear()
+
+    for entity in iter_entities(dump_path):
+
+        if entity.get("type", "item") != "item":
+            continue
+
+        record, names, popularity = slim_entity(entity)
+
+        if not record["label"] and not record["claims"]:
+            continue
+
+        entity_rows.append((record["id"], json.dumps(record, separators=(",", ":"))))
+
+        for name, rank in names:
+            name_rows.append((name, record["id"], rank, popularity))
+
+        count += 1
+
+        if len(entity_rows) >= BATCH_SIZE:
+            flush()
+
+    flush()
+
+    conn.execute("CREATE INDEX names_by_name ON names (name, rank, popularity DESC)")
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+
+    return count
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(
+        description="Build the offline Wikidata store from a JSON dump (or subset)."
+    )
+    parser.add_argument("dump", help="latest-all.json[.gz|.bz2] or a JSON-lines subset")
+    parser.add_argument("store", help="output SQLite file, e.g. wikidata_store.sqlite3")
+
+    args = parser.parse_args()
+
+    n = build_store(args.dump, args.store)
+
+    print(f"Stored {n} entities in {args.store}")
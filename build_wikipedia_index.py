@@ -0,0 +1,158 @@
+import argparse
+import bz2
+import gzip
+import os
+import sqlite3
+import xml.etree.ElementTree as ET
+
+from wikipedia_index import fold_key, title_key
+
+# Rows per INSERT batch.
+BATCH_SIZE = 10000
+
+TITLE_PREFIX = "Wikipedia: "
+
+
+def open_dump(path):
+
+    if path.endswith(".bz2"):
+        return bz2.open(path, "rb")
+
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+
+    return open(path, "rb")
+
+
+def iter_abstracts(path):
+    """
+    Streams (title, url, abstract) from an enwiki abstract dump
+    (enwiki-latest-abstract.xml), one <doc> at a time.
+    """
+
+    with open_dump(path) as f:
+
+        root = None
+
+        for event, elem in ET.iterparse(f, events=("start", "end")):
+
+            if root is None:
+                root = elem
+
+            if event != "end" or elem.tag != "doc":
+                continue
+
+            title = elem.findtext("title", "")
+
+            if title.startswith(TITLE_PREFIX):
+                title = title[len(TITLE_PREFIX):]
+
+            yield (
+                title,
+                elem.findtext("url", ""),
+                elem.findtext("abstract", "") or ""
+            )
+
+            # Cleared docs stay attached to <feed>; drop them too
+            elem.clear()
+            root.clear()
+
+
+def iter_redirects(path):
+    """
+    Streams (from_title, to_title) pairs from a tab-separated file.
+    """
+
+    with open(path, "r", encoding="utf-8") as f:
+
+        for line in f:
+
+            parts = line.rstrip("\n").split("\t")
+
+            if len(parts) == 2 and parts[0] and parts[1]:
+                yield parts[0], parts[1]
+
+
+def build_index(abstracts_path, index_path, redirects_path=None):
+
+    if os.path.exists(index_path):
+        os.remove(index_path)
+
+    conn = sqlite3.connect(index_path)
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+
+    conn.execute(
+        "CREATE TABLE pages (id INTEGER PRIMARY KEY, title_key TEXT UNIQUE,"
+        " fold_key TEXT NOT NULL, title TEXT NOT NULL, url TEXT NOT NULL,"
+        " abstract TEXT NOT NULL)"
+    )
+    conn.execute(
+        "CREATE TABLE redirects (from_key TEXT PRIMARY KEY, from_fold TEXT NOT NULL,"
+        " to_title TEXT NOT NULL) WITHOUT ROWID"
+    )
+    conn.execute(
+        "CREATE VIRTUAL TABLE pages_fts USING fts5("
+        " title, abstract, content='pages', content_rowid='id')"
+    )
+
+    insert = (
+        "INSERT OR IGNORE INTO pages (title_key, fold_key, title, url, abstract)"
+        " VALUES (?, ?, ?, ?, ?)"
+    )
+
+    rows = []
+    changes_before = conn.total_changes
+
+    for title, url, abstract in iter_abstracts(abstracts_path):
+
+        rows.append((title_key(title), fold_key(title), title, url, abstract))
+
+        if len(rows) >= BATCH_SIZE:
+            conn.executemany(insert, rows)
+            rows.clear()
+
+    conn.executemany(insert, rows)
+
+    # Duplicate titles are ignored: count the pages actually stored
+    count = conn.total_changes - changes_before
+
+    if redirects_path:
+        conn.executemany(
+            "INSERT OR REPLACE INTO redirects VALUES (?, ?, ?)",
+            (
+                (title_key(source), fold_key(source), target)
+                for source, target in iter_redirects(redirects_path)
+            )
+        )
+
+    # Case-insensitive fallback lookups; built once, after the load
+    conn.execute("CREATE INDEX pages_fold ON pages (fold_key)")
+    conn.execute("CREATE INDEX redirects_fold ON redirects (from_fold)")
+
+    conn.execute("INSERT INTO pages_fts (pages_fts) VALUES ('rebuild')")
+    conn.execute("INSERT INTO pages_fts (pages_fts) VALUES ('optimize')")
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+
+    return count
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(
+        description="Build the offline Wikipedia abstract index from an abstracts dump."
+    )
+    parser.add_argument("abstracts", help="enwiki-latest-abstract.xml[.gz|.bz2]")
+    parser.add_argument("index", help="output SQLite file, e.g. wikipedia_index.sqlite3")
+    parser.add_argument(
+        "--redirects",
+        help="optional TSV of 'from title<TAB>to title' redirect pairs"
+    )
+
+    args = parser.parse_args()
+
+    n = build_index(args.abstracts, args.index, args.redirects)
+
+    print(f"Indexed {n} abstracts in {args.index}")
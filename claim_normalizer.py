@@ -2,612 +2,276 @@ import re
 from semantic_relation_detector import detect_relation
 from entity_linker import canonicalize_entity
 from negation_detector import contains_negation
+from phrase_scanner import scan
 
-def normalize_claim(text: str) -> dict:
+# ==========================================
+# RELATION GRAMMAR
+# ==========================================
+# One rule per claim shape, in priority order (first match wins):
+#   (relation, pattern, triggers, kind, negated)
+#
+# triggers: phrases, one of which the pattern needs literally.
+#           Only rules whose trigger occurs in the text are tried.
+# kind:     how match groups become a claim (see BUILDERS);
+#           "semantic" rules also need detect_relation() to
+#           report their relation.
+# negated:  True for explicitly negated shapes, None to use
+#           negation detection on the whole text.
+
+RELATION_GRAMMAR = [
+
+    ("capital_of", r"(.*?) is not the capital of (.*)", ["is not the capital of"], "pair", True),
 
-    text = text.strip().lower()
-    negated = contains_negation(text)
-    
-    match = re.search(
-        r"(.*?) is not the capital of (.*)",
-        text
-    )
-
-    if match:
-        return {
-            "type": "structured",
-            "relation": "capital_of",
-            "subject": canonicalize_entity(
-                match.group(1)
-            ).title(),
-            "object": canonicalize_entity(
-                match.group(2)
-            ).title(),
-            "value": None,
-            "negated": True
-        }
-    # ==========================================
     # CAPITAL RELATION
-    # ==========================================
-    match = re.search(r"(.*?) is the capital of (.*)", text)
-
-    if match:
-        return {
-            "type": "structured",
-            "relation": "capital_of",
-            "subject": canonicalize_entity(
-                match.group(1)
-            ).title(),
-            "object": canonicalize_entity(
-                match.group(2)
-            ).title(),
-            "value": None,
-            "negated": negated
-        }
+    ("capital_of", r"(.*?) is the capital of (.*)", ["is the capital of"], "pair", None),
 
-    # ==========================================
     # COUNT RELATION
-    # ==========================================
-    match = re.search(r"(.*?) has (\d+) (.*)", text)
-
-    if match:
-        return {
-            "type": "structured",
-            "relation": "count",
-            "subject": canonicalize_entity(
-                match.group(1)
-            ).title(),
-            "object": canonicalize_entity(
-                match.group(3).replace("s", "").replace("ies", "y")
-            ).title(),
-            "value": int(match.group(2)),
-            "negated": negated
-        }
-        # ==========================================
+    ("count", r"(.*?) has (\d+) (.*)", ["has"], "count", None),
+
     # INDEPENDENCE YEAR
     # India became independent in 1947
-    # ==========================================
-    match = re.search(
-        r"(.*?) became independent in (\d{4})",
-        text
-    )
-
-    if match:
-        return {
-            "type": "structured",
-            "relation": "independence_year",
-            "subject": canonicalize_entity(
-                match.group(1)
-            ).title(),
-            "object": None,
-            "value": int(match.group(2)),
-            "negated": negated
-        }
+    ("independence_year", r"(.*?) became independent in (\d{4})", ["became independent in"], "year", None),
 
-    # ==========================================
     # DEATH YEAR
     # Einstein died in 1955
-    # ==========================================
-    match = re.search(
-        r"(.*?) died in (\d{4})",
-        text
-    )
-
-    if match:
-        return {
-            "type": "structured",
-            "relation": "death_year",
-            "subject": canonicalize_entity(
-                match.group(1)
-            ).title(),
-            "object": None,
-            "value": int(match.group(2)),
-            "negated": negated
-        }
+    ("death_year", r"(.*?) died in (\d{4})", ["died in"], "year", None),
 
-    # ==========================================
     # BIRTH YEAR
     # Einstein was born in 1879
-    # ==========================================
-    match = re.search(
-        r"(.*?) was born in (\d{4})",
-        text
-    )
-
-    if match:
-        return {
-            "type": "structured",
-            "relation": "birth_year",
-            "subject": canonicalize_entity(
-                match.group(1)
-            ).title(),
-            "object": None,
-            "value": int(match.group(2)),
-            "negated": negated
-        }
+    ("birth_year", r"(.*?) was born in (\d{4})", ["was born in"], "year", None),
 
-    # ==========================================
     # EVENT YEAR
     # World War II ended in 1945
-    # ==========================================
-    match = re.search(
-        r"(.*?) ended in (\d{4})",
-        text
-    )
-
-    if match:
-        return {
-            "type": "structured",
-            "relation": "end_year",
-            "subject": canonicalize_entity(
-                match.group(1)
-            ).title(),
-            "object": None,
-            "value": int(match.group(2)),
-            "negated": negated
-        }
+    ("end_year", r"(.*?) ended in (\d{4})", ["ended in"], "year", None),
 
-    # ==========================================
     # LOCATION RELATION
-    # ==========================================
-    match = re.search(r"(.*?) is in (.*)", text)
-
-    if match:
-        return {
-            "type": "structured",
-            "relation": "located_in",
-            "subject": canonicalize_entity(
-                match.group(1)
-            ).title(),
-            "object": canonicalize_entity(
-                match.group(2)
-            ).title(),
-            "value": None,
-            "negated": negated
-        }
-    match = re.search(
-        r"(.*?) was not born in (.*)",
-        text
-    )
-
-    if match:
-        return {
-            "type": "structured",
-            "relation": "born_in",
-            "subject": canonicalize_entity(
-                match.group(1)
-            ).title(),
-            "object": canonicalize_entity(
-                match.group(2)
-            ).title(),
-            "value": None,
-            "negated": True
-        }
+    ("located_in", r"(.*?) is in (.*)", ["is in"], "pair", None),
+
+    ("born_in", r"(.*?) was not born in (.*)", ["was not born in"], "pair", True),
 
-    # ==========================================
     # BORN IN
-    # ==========================================
-    match = re.search(r"(.*?) was born in (.*)", text)
-
-    if match:
-        return {
-            "type": "structured",
-            "relation": "born_in",
-            "subject": canonicalize_entity(
-                match.group(1)
-            ).title(),
-            "object": canonicalize_entity(
-                match.group(2)
-            ).title(),
-            "value": None,
-            "negated": negated
-        }
-    match = re.search(
-        r"(.*?) did not die in (.*)",
-        text
-    )
-
-    if match:
-        return {
-            "type": "structured",
-            "relation": "died_in",
-            "subject": canonicalize_entity(
-                match.group(1)
-            ).title(),
-            "object": canonicalize_entity(
-                match.group(2)
-            ).title(),
-            "value": None,
-            "negated": True
-        }
+    ("born_in", r"(.*?) was born in (.*)", ["was born in"], "pair", None),
+
+    ("died_in", r"(.*?) did not die in (.*)", ["did not die in"], "pair", True),
 
-    # ==========================================
     # DIED IN
-    # ==========================================
-    match = re.search(r"(.*?) died in (.*)", text)
-
-    if match:
-        return {
-            "type": "structured",
-            "relation": "died_in",
-            "subject": canonicalize_entity(
-                match.group(1)
-            ).title(),
-            "object": canonicalize_entity(
-                match.group(2)
-            ).title(),
-            "value": None,
-            "negated": negated
-        }
+    ("died_in", r"(.*?) died in (.*)", ["died in"], "pair", None),
 
-    # ==========================================
     # INVENTED BY
-    # ==========================================
-    match = re.search(r"(.*?) invented (.*)", text)
-
-    if match:
-        return {
-            "type": "structured",
-            "relation": "invented_by",
-            "subject": canonicalize_entity(
-                match.group(1)
-            ).title(),
-            "object": canonicalize_entity(
-                match.group(2)
-            ).title(),
-            "value": None,
-            "negated": negated
-        }
+    ("invented_by", r"(.*?) invented (.*)", ["invented"], "pair", None),
 
-    # ==========================================
     # OCCUPATION
     # Einstein was a physicist
-    # ==========================================
-    match = re.search(r"(.*?) was a[n]? (.*)", text)
-
-    if match:
-        return {
-            "type": "structured",
-            "relation": "occupation",
-            "subject": canonicalize_entity(
-                match.group(1)
-            ).title(),
-            "object": canonicalize_entity(
-                match.group(2)
-            ).title(),
-            "value": None,
-            "negated": negated
-        }
-
-    match = re.search(
-        r"(.*?) was not (.*)",
-        text
-    )
-
-    if match:
-        return {
-            "type": "structured",
-            "relation": "nationality",
-            "subject": canonicalize_entity(
-                match.group(1)
-            ).title(),
-            "object": canonicalize_entity(
-                match.group(2)
-            ).title(),
-            "value": None,
-            "negated": True
-        }
-    
-    # ==========================================
-# COMPARISON
-# ==========================================
+    ("occupation", r"(.*?) was a[n]? (.*)", ["was a"], "pair", None),
 
-    match = re.search(
-        r"(.*?) is (not )?(taller|higher|bigger|larger) than (.*)",
-        text
-    )
-
-    if match:
-
-        relation_map = {
-            "taller": "taller_than",
-            "higher": "taller_than",
-            "bigger": "larger_than",
-            "larger": "larger_than"
-        }
-
-        return {
-            "type": "structured",
-            "relation": "comparison",
-            "subject": canonicalize_entity(
-                match.group(1)
-            ).title(),
-
-            "object": canonicalize_entity(
-                match.group(4)
-            ).title(),
-
-            "comparison": relation_map[
-                match.group(3)
-            ],
-
-            "negated": bool(
-                match.group(2)
-            )
-        }
+    ("nationality", r"(.*?) was not (.*)", ["was not"], "pair", True),
+
+    # COMPARISON
+    ("comparison", r"(.*?) is (not )?(taller|higher|bigger|larger) than (.*)", ["than"], "comparison", None),
 
-    # ==========================================
     # NATIONALITY
     # Hitler was British
     # Einstein was German
-    # ==========================================
-    match = re.search(r"(.*?) was (.*)", text)
-
-    if match:
-        return {
-            "type": "structured",
-            "relation": "nationality",
-            "subject": canonicalize_entity(
-                match.group(1)
-            ).title(),
-            "object": canonicalize_entity(
-                match.group(2)
-            ).title(),
-            "value": None,
-            "negated": negated
-        }
-    
-    match = re.search(
-        r"(.*?) is not a[n]? (.*)",
-        text
-    )
-
-    if match:
-        return {
-            "type": "structured",
-            "relation": "is_a",
-            "subject": canonicalize_entity(
-                match.group(1)
-            ).title(),
-            "object": canonicalize_entity(
-                match.group(2)
-            ).title(),
-            "value": None,
-            "negated": True
-        }
+    ("nationality", r"(.*?) was (.*)", ["was"], "pair", None),
+
+    ("is_a", r"(.*?) is not a[n]? (.*)", ["is not a"], "pair", True),
 
-    # ==========================================
     # IS-A RELATION
     # Kangaroo is a marsupial
-    # ==========================================
-    match = re.search(r"(.*?) is a[n]? (.*)", text)
-
-    if match:
-        return {
-            "type": "structured",
-            "relation": "is_a",
-            "subject": canonicalize_entity(
-                match.group(1)
-            ).title(),
-            "object": canonicalize_entity(
-                match.group(2)
-            ).title(),
-            "value": None,
-            "negated": negated
-        }
+    ("is_a", r"(.*?) is a[n]? (.*)", ["is a"], "pair", None),
 
-    # ==========================================
     # SEMANTIC RELATION DETECTION
-    # ==========================================
+    ("nationality", r"(.*?) (?:citizen of|nationality|citizenship) (.*)",
+     ["citizen of", "nationality", "citizenship"], "semantic", None),
 
-    relation = detect_relation(text)
+    ("occupation", r"(.*?) (?:worked as|served as|occupation|profession) (.*)",
+     ["worked as", "served as", "occupation", "profession"], "semantic", None),
 
-    if relation:
+    ("located_in", r"(.*?) (?:located in|situated in|inside|part of) (.*)",
+     ["located in", "situated in", "inside", "part of"], "semantic", None),
 
-        # Nationality patterns
-        if relation == "nationality":
+    # NEGATED CAUSE-EFFECT
+    ("causes", r"(.*?) does not cause (.*)", ["does not cause"], "pair", True),
+    ("causes", r"(.*?) does not lead to (.*)", ["does not lead to"], "pair", True),
+    ("causes", r"(.*?) does not result in (.*)", ["does not result in"], "pair", True),
 
-            match = re.search(
-                r"(.*?) (?:citizen of|nationality|citizenship) (.*)",
-                text
-            )
+    # CAUSE-EFFECT
+    # X causes Y / X leads to Y / X results in Y
+    ("causes", r"(.*?) causes (.*)", ["causes"], "pair", None),
+    ("causes", r"(.*?) leads to (.*)", ["leads to"], "pair", None),
+    ("causes", r"(.*?) results in (.*)", ["results in"], "pair", None)
+]
 
-            if match:
-
-                return {
-                    "type": "structured",
-                    "relation": "nationality",
-                    "subject": canonicalize_entity(
-                        match.group(1)
-                    ).title(),
-                    "object": canonicalize_entity(
-                        match.group(2)
-                    ).title(),
-                    "value": None,
-                    "negated": negated
-                }
-
-        # Occupation patterns
-        elif relation == "occupation":
-
-            match = re.search(
-                r"(.*?) (?:worked as|served as|occupation|profession) (.*)",
-                text
-            )
+COMPARISON_RELATIONS = {
+    "taller": "taller_than",
+    "higher": "taller_than",
+    "bigger": "larger_than",
+    "larger": "larger_than"
+}
 
-            if match:
 
-                return {
-                    "type": "structured",
-                    "relation": "occupation",
-                    "subject": canonicalize_entity(match.group(1)).title(),
-                    "object": canonicalize_entity(match.group(2)).title(),
-                    "value": None,
-                    "negated": negated
-                }
+# ==========================================
+# CLAIM BUILDERS
+# ==========================================
+def _entity(text):
 
-        # Location patterns
-        elif relation == "located_in":
+    return canonicalize_entity(text).title()
 
-            match = re.search(
-                r"(.*?) (?:located in|situated in|inside|part of) (.*)",
-                text
-            )
 
-            if match:
-
-                return {
-                    "type": "structured",
-                    "relation": "located_in",
-                    "subject": canonicalize_entity(match.group(1)).title(),
-                    "object": canonicalize_entity(match.group(2)).title(),
-                    "value": None,
-                    "negated": negated
-                }
-            
-    # ==========================================
-    # NEGATED CAUSE-EFFECT
-    # ==========================================
+def _build_pair(relation, match, negated):
 
-    match = re.search(
-        r"(.*?) does not cause (.*)",
-        text
-    )
-
-    if match:
-
-        return {
-            "type": "structured",
-            "relation": "causes",
-            "subject": canonicalize_entity(
-                match.group(1)
-            ).title(),
-            "object": canonicalize_entity(
-                match.group(2)
-            ).title(),
-            "value": None,
-            "negated": True
-        }
-    
-    match = re.search(
-        r"(.*?) does not lead to (.*)",
-        text
-    )
-
-    if match:
-
-        return {
-            "type": "structured",
-            "relation": "causes",
-            "subject": canonicalize_entity(
-                match.group(1)
-            ).title(),
-            "object": canonicalize_entity(
-                match.group(2)
-            ).title(),
-            "value": None,
-            "negated": True
-        }
-    
-    match = re.search(
-        r"(.*?) does not result in (.*)",
-        text
-    )
-
-    if match:
-
-        return {
-            "type": "structured",
-            "relation": "causes",
-            "subject": canonicalize_entity(
-                match.group(1)
-            ).title(),
-            "object": canonicalize_entity(
-                match.group(2)
-            ).title(),
-            "value": None,
-            "negated": True
-        }
-    # ==========================================
-    # CAUSE-EFFECT
-    # X causes Y
-    # ==========================================
+    return {
+        "type": "structured",
+        "relation": relation,
+        "subject": _entity(match.group(1)),
+        "object": _entity(match.group(2)),
+        "value": None,
+        "negated": negated
+    }
 
-    match = re.search(
-        r"(.*?) causes (.*)",
-        text
-    )
 
-    if match:
+def _build_year(relation, match, negated):
 
-        return {
-            "type": "structured",
-            "relation": "causes",
-            "subject": canonicalize_entity(
-                match.group(1)
-            ).title(),
-            "object": canonicalize_entity(
-                match.group(2)
-            ).title(),
-            "value": None,
-            "negated": negated
-        }
+    return {
+        "type": "structured",
+        "relation": relation,
+        "subject": _entity(match.group(1)),
+        "object": None,
+        "value": int(match.group(2)),
+        "negated": negated
+    }
 
 
-    # ==========================================
-    # X leads to Y
-    # ==========================================
+def _build_count(relation, match, negated):
 
-    match = re.search(
-        r"(.*?) leads to (.*)",
-        text
-    )
-
-    if match:
-
-        return {
-            "type": "structured",
-            "relation": "causes",
-            "subject": canonicalize_entity(
-                match.group(1)
-            ).title(),
-            "object": canonicalize_entity(
-                match.group(2)
-        ).title(),
-        "value": None,
+    return {
+        "type": "structured",
+        "relation": relation,
+        "subject": _entity(match.group(1)),
+        "object": _entity(
+            match.group(3).replace("s", "").replace("ies", "y")
+        ),
+        "value": int(match.group(2)),
         "negated": negated
     }
 
 
-    # ==========================================
-    # X results in Y
-    # ==========================================
+def _build_comparison(relation, match, negated):
+
+    return {
+        "type": "structured",
+        "relation": relation,
+        "subject": _entity(match.group(1)),
+        "object": _entity(match.group(4)),
+        "comparison": COMPARISON_RELATIONS[match.group(3)],
+        "negated": bool(match.group(2))
+    }
+
+
+BUILDERS = {
+    "pair": _build_pair,
+    "semantic": _build_pair,
+    "year": _build_year,
+    "count": _build_count,
+    "comparison": _build_comparison
+}
 
-    match = re.search(
-        r"(.*?) results in (.*)",
-        text
-    )
-
-    if match:
-
-        return {
-            "type": "structured",
-            "relation": "causes",
-            "subject": canonicalize_entity(
-                match.group(1)
-            ).title(),
-            "object": canonicalize_entity(
-                match.group(2)
-            ).title(),
-            "value": None,
-            "negated": negated
-        }        
 
 # ==========================================
-# SEMANTIC RELATION FALLBACK
+# COMPILED GRAMMAR + TRIGGER INDEX
 # ==========================================
+def _compile_grammar(grammar):
+    """
+    Precompiles every rule and indexes it under one word of each
+    trigger phrase. The word always appears as a whole token in
+    text that contains the trigger, since triggers are space-
+    delimited in the patterns.
+
+    Patterns are anchored at line starts: a leading (.*?) can only
+    match from there, and unanchored it would be retried from every
+    position of a non-matching text.
+    """
+
+    rules = []
+    index = {}
+
+    for priority, (relation, pattern, triggers, kind, negated) in enumerate(grammar):
+
+        rules.append((
+            relation,
+            re.compile("^" + pattern, re.MULTILINE),
+            [" " + trigger for trigger in triggers],
+            BUILDERS[kind],
+            negated,
+            kind == "semantic"
+        ))
+
+        for trigger in triggers:
+            keyword = max(trigger.split(), key=len)
+            index.setdefault(keyword, set()).add(priority)
+
+    return rules, index
+
 
-    relation = detect_relation(text)
+_rules, _trigger_index = _compile_grammar(RELATION_GRAMMAR)
+
+
+def candidate_rules(text):
+    """
+    Priorities of the rules whose trigger phrase occurs in text,
+    found from one pass over its tokens.
+    """
+
+    candidates = set()
+
+    for token in set(text.split()):
+
+        priorities = _trigger_index.get(token)
+
+        if priorities:
+            candidates.update(priorities)
+
+    return sorted(candidates)
+
+
+def normalize_claim(text: str) -> dict:
+
+    text = text.strip().lower()
+    hits = scan(text)
+    negated = contains_negation(text, hits)
+
+    semantic_relation = None
+    semantic_checked = False
+
+    for priority in candidate_rules(text):
+
+        relation, regex, triggers, build, rule_negated, semantic = _rules[priority]
+
+        if not any(trigger in text for trigger in triggers):
+            continue
+
+        if semantic:
+
+            if not semantic_checked:
+                semantic_relation = detect_relation(text, hits)
+                semantic_checked = True
+
+            if semantic_relation != relation:
+                continue
+
+        match = regex.search(text)
+
+        if match:
+            return build(
+                relation,
+                match,
+                negated if rule_negated is None else rule_negated
+            )
+
+    # ==========================================
+    # SEMANTIC RELATION FALLBACK
+    # ==========================================
+    relation = detect_relation(text, hits)
 
     if relation:
 
@@ -622,7 +286,7 @@ def normalize_claim(text: str) -> dict:
                 "object": words[-1].title(),
                 "value": None,
                 "negated": negated
-           }
+            }
 
     # ==========================================
     # FALLBACK
@@ -634,4 +298,4 @@ def normalize_claim(text: str) -> dict:
         "object": None,
         "value": None,
         "negated": negated
-    }
\ No newline at end of file
+    }
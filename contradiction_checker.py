@@ -1,4 +1,17 @@
-def check_contradiction(statement: str, evidence_text: str) -> bool:
+from phrase_scanner import register_lexicon, scan
+
+STATEMENT_LEXICON = register_lexicon(
+    "contradiction.statement",
+    ["capital", "poorest", "richest"]
+)
+
+EVIDENCE_LEXICON = register_lexicon(
+    "contradiction.evidence",
+    ["not the capital", "wealthiest", "poorest"]
+)
+
+
+def check_contradiction(statement: str, evidence_text: str, hits=None) -> bool:
     """
     Conservative contradiction detection.
 
@@ -6,18 +19,25 @@ def check_contradiction(statement: str, evidence_text: str) -> bool:
     contradicts the claim.
     """
 
-    statement = statement.lower()
-    evidence_text = evidence_text.lower()
+    if hits is None:
+        hits = scan(statement)
+
+    claim_terms = set(hits.phrases(STATEMENT_LEXICON))
+
+    if not claim_terms:
+        return False
+
+    evidence_terms = set(scan(evidence_text).phrases(EVIDENCE_LEXICON))
 
     # Capital contradiction
-    if "capital" in statement and "not the capital" in evidence_text:
+    if "capital" in claim_terms and "not the capital" in evidence_terms:
         return True
 
     # Richest vs poorest
-    if "poorest" in statement and "wealthiest" in evidence_text:
+    if "poorest" in claim_terms and "wealthiest" in evidence_terms:
         return True
 
-    if "richest" in statement and "poorest" in evidence_text:
+    if "richest" in claim_terms and "poorest" in evidence_terms:
         return True
 
-    return False
\ No newline at end of file
+    return False
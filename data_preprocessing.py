@@ -1,15 +1,51 @@
+import hashlib
+import importlib.util
+import json
+import os
+
 import pandas as pd
 
 # -------------------------------------------------
 # CONFIG
 # -------------------------------------------------
-DATASET_PATH = DATASET_PATH = r"E:\College\DSC_Hack_hybrid\ffff_final_1.xlsx"   # adjust if needed
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# .xlsx/.xls, .csv, .jsonl or .parquet
+DATASET_PATH = os.environ.get(
+    "DATASET_PATH",
+    os.path.join(BASE_DIR, "ffff_final_1.xlsx")
+)
+
+# Excel workbooks are converted once into this directory
+DATASET_CACHE_DIR = os.environ.get(
+    "DATASET_CACHE_DIR",
+    os.path.join(BASE_DIR, ".dataset_cache")
+)
+
+# Columns preprocess_dataset() keeps; pass as columns= to load only these
+PREPROCESS_COLUMNS = [
+    "ai_response",
+    "topic",
+    "label_hallucination",
+    "hallucination_type",
+    "label_bias",
+    "bias_type",
+    "corrected_response"
+]
+
+EXCEL_SUFFIXES = (".xlsx", ".xlsm", ".xls")
+JSONL_SUFFIXES = (".jsonl", ".ndjson")
+PARQUET_SUFFIXES = (".parquet", ".pq")
+
+# pyarrow is optional: without it the Excel cache is a pandas pickle
+# and .parquet datasets cannot be read.
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
 
 # -------------------------------------------------
-# LOAD DATASET
+# EXCEL -> COLUMNAR CACHE
 # -------------------------------------------------
-def load_dataset(path=DATASET_PATH):
-    df = pd.read_excel(path)
+def _normalize_columns(df):
 
     # Rename columns (safety)
     df.columns = df.columns.str.strip().str.lower()
@@ -17,6 +53,217 @@ def load_dataset(path=DATASET_PATH):
     return df
 
 
+def _file_sha256(path):
+
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+def _write_atomic(path, write):
+
+    tmp_path = path + ".tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _cached_excel(path):
+    """
+    Path of the columnar copy of an Excel workbook, converting it on
+    first use. Copies are named by content hash; index.json maps a
+    source's (mtime, size) to its hash so an unchanged workbook is
+    not even re-hashed.
+    """
+
+    os.makedirs(DATASET_CACHE_DIR, exist_ok=True)
+
+    index_path = os.path.join(DATASET_CACHE_DIR, "index.json")
+
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}
+
+    source = os.path.abspath(path)
+    stat = os.stat(path)
+
+    entry = index.get(source)
+
+    if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+        sha256 = entry["sha256"]
+    else:
+        sha256 = _file_sha256(path)
+
+    stem = os.path.splitext(os.path.basename(path))[0]
+    suffix = ".parquet" if HAS_PYARROW else ".pkl"
+
+    cache_path = os.path.join(DATASET_CACHE_DIR, f"{stem}-{sha256[:16]}{suffix}")
+
+    if not os.path.exists(cache_path):
+
+        df = _normalize_columns(pd.read_excel(path))
+
+        if HAS_PYARROW:
+            # Parquet columns need one type: stringify stray non-text
+            # cells (numbers in text columns), keep missing values
+            for column in df.columns[df.dtypes == object]:
+                df[column] = df[column].map(
+                    lambda v: v if isinstance(v, str) or pd.isna(v) else str(v)
+                )
+
+            _write_atomic(cache_path, lambda p: df.to_parquet(p, index=False))
+        else:
+            _write_atomic(cache_path, df.to_pickle)
+
+    if entry != {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": sha256}:
+
+        index[source] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": sha256
+        }
+
+        def write_index(p):
+            with open(p, "w", encoding="utf-8") as f:
+                json.dump(index, f, indent=2)
+
+        _write_atomic(index_path, write_index)
+
+    return cache_path
+
+
+def _resolve(path):
+    """
+    (format, path to read): Excel resolves to its cached copy.
+    """
+
+    lower_path = path.lower()
+
+    if lower_path.endswith(EXCEL_SUFFIXES):
+        cache_path = _cached_excel(path)
+        return ("parquet" if HAS_PYARROW else "pickle"), cache_path
+
+    if lower_path.endswith(".csv"):
+        return "csv", path
+
+    if lower_path.endswith(JSONL_SUFFIXES):
+        return "jsonl", path
+
+    if lower_path.endswith(PARQUET_SUFFIXES):
+        if not HAS_PYARROW:
+            raise ImportError("Reading .parquet datasets requires pyarrow")
+        return "parquet", path
+
+    raise ValueError(f"Unsupported dataset format: {path}")
+
+
+def _projection(names, columns):
+    """
+    The names among a file's column names whose normalized form is
+    in columns (all of them when columns is None).
+    """
+
+    if columns is None:
+        return None
+
+    wanted = set(columns)
+
+    return [name for name in names if name.strip().lower() in wanted]
+
+
+def _select_columns(df, columns, path):
+    """
+    df restricted to columns (normalized names), in file order.
+    Raises ValueError naming any column the dataset lacks.
+    """
+
+    if columns is None:
+        return df
+
+    missing = [name for name in columns if name not in df.columns]
+
+    if missing:
+        raise ValueError(f"Dataset {path} is missing columns: {', '.join(missing)}")
+
+    return df[[name for name in df.columns if name in columns]]
+
+
+# -------------------------------------------------
+# LOAD DATASET
+# -------------------------------------------------
+def load_dataset(path=DATASET_PATH, columns=None):
+    """
+    Loads the dataset with lowercased column names. columns limits
+    what is read to those (normalized) columns where the format
+    allows it; a ValueError names any that are missing.
+    """
+
+    file_format, source = _resolve(path)
+
+    if file_format == "parquet":
+        import pyarrow.parquet as pq
+
+        names = pq.read_schema(source).names
+        df = pd.read_parquet(source, columns=_projection(names, columns))
+
+    elif file_format == "csv":
+        usecols = None if columns is None else (lambda name: name.strip().lower() in columns)
+        df = pd.read_csv(source, usecols=usecols)
+
+    elif file_format == "jsonl":
+        df = pd.read_json(source, lines=True)
+
+    else:
+        df = pd.read_pickle(source)
+
+    return _select_columns(_normalize_columns(df), columns, path)
+
+
+# -------------------------------------------------
+# CHUNKED LOADING (STREAMING TRAINING)
+# -------------------------------------------------
+def iter_dataset(path=DATASET_PATH, chunksize=10000, columns=None):
+    """
+    Yields the dataset as DataFrames of at most chunksize rows, with
+    the same column handling as load_dataset(). CSV, JSON Lines and
+    Parquet (including cached Excel) are read incrementally.
+    """
+
+    file_format, source = _resolve(path)
+
+    if file_format == "parquet":
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(source)
+
+        chunks = (
+            batch.to_pandas()
+            for batch in parquet_file.iter_batches(
+                batch_size=chunksize,
+                columns=_projection(parquet_file.schema_arrow.names, columns)
+            )
+        )
+
+    elif file_format == "csv":
+        usecols = None if columns is None else (lambda name: name.strip().lower() in columns)
+        chunks = pd.read_csv(source, usecols=usecols, chunksize=chunksize)
+
+    elif file_format == "jsonl":
+        chunks = pd.read_json(source, lines=True, chunksize=chunksize)
+
+    else:
+        df = pd.read_pickle(source)
+        chunks = (df.iloc[i:i + chunksize] for i in range(0, len(df), chunksize))
+
+    for chunk in chunks:
+        yield _select_columns(_normalize_columns(chunk), columns, path)
+
+
 # -------------------------------------------------
 # SELECT & CLEAN REQUIRED COLUMNS
 # -------------------------------------------------
@@ -25,18 +272,8 @@ def preprocess_dataset(df: pd.DataFrame) -> pd.DataFrame:
     Keeps only dataset-aligned columns and removes noisy / unused ones.
     """
 
-    required_columns = [
-        "ai_response",
-        "topic",
-        "label_hallucination",
-        "hallucination_type",
-        "label_bias",
-        "bias_type",
-        "corrected_response"
-    ]
-
     # Keep only required columns
-    df = df[required_columns]
+    df = df[PREPROCESS_COLUMNS]
 
     # Drop rows with missing labels
     df = df.dropna(
@@ -91,7 +328,7 @@ def get_training_sets(df: pd.DataFrame):
 # DEBUG / SANITY CHECK
 # -------------------------------------------------
 if __name__ == "__main__":
-    df = load_dataset()
+    df = load_dataset(columns=PREPROCESS_COLUMNS)
     df_clean = preprocess_dataset(df)
 
     print("Dataset shape after cleaning:", df_clean.shape)
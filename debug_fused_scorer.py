@@ -0,0 +1,133 @@
+import os
+import random
+
+import joblib
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+
+from fused_scorer import FusedScorer
+from model_export import has_exported_models, load_exported_models
+
+# Parity check: fused scorer (from the pickles, and from the
+# pickle-free export if present) vs the four sklearn pickles
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def load(name):
+    return joblib.load(os.path.join(BASE_DIR, f"{name}.pkl"))
+
+
+tfidf = load("tfidf_vectorizer")
+hallucination_flag_model = load("hallucination_flag_model")
+hallucination_type_model = load("hallucination_type_model")
+bias_flag_model = load("bias_flag_model")
+bias_type_model = load("bias_type_model")
+
+fused_scorers = {
+    "pickles": (tfidf, FusedScorer.from_models(
+        hallucination_flag_model,
+        hallucination_type_model,
+        bias_flag_model,
+        bias_type_model
+    ))
+}
+
+export_dir = os.path.join(BASE_DIR, "model_export")
+
+if has_exported_models(export_dir):
+    fused_scorers["export"] = load_exported_models(export_dir)
+
+SENTENCES = [
+    "paris is the capital of france",
+    "women are bad drivers",
+    "the great wall of china is visible from space",
+    "humans use only ten percent of their brain",
+    "einstein was born in 1879",
+    "old people cannot learn technology",
+    "vaccines cause autism",
+    "mount everest is taller than k2"
+]
+
+# Random word salads over the fitted vocabulary
+random.seed(0)
+vocabulary = sorted(tfidf.vocabulary_)
+
+texts = SENTENCES + [
+    " ".join(random.choice(vocabulary) for _ in range(random.randint(1, 15)))
+    for _ in range(5000)
+] + ["", "   ", "Ünïcödé wörds, MIXED case & punctuation!!", "a b c"]
+
+X = tfidf.transform(texts)
+
+h_preds = hallucination_flag_model.predict(X)
+h_probs = hallucination_flag_model.predict_proba(X)[:, 1]
+h_types = hallucination_type_model.predict(X)
+
+b_preds = bias_flag_model.predict(X)
+b_probs = bias_flag_model.predict_proba(X)[:, 1]
+b_types = bias_type_model.predict(X)
+
+
+def check(name, featurizer, scorer):
+
+    X_name = featurizer.transform(texts)
+
+    if name != "pickles":
+        print(f"{name}: max TF-IDF difference {abs(X_name - X).max():.2e}")
+
+    fused = scorer.score(X_name)
+    mismatches = 0
+
+    for i, scores in enumerate(fused):
+
+        expected_h_type = h_types[i] if h_preds[i] else "none"
+        expected_b_type = b_types[i] if b_preds[i] else "none"
+
+        if (
+            scores["h_pred"] != h_preds[i]
+            or scores["b_pred"] != b_preds[i]
+            or scores["h_type_pred"] != expected_h_type
+            or scores["b_type_pred"] != expected_b_type
+            or not np.isclose(scores["h_prob"], h_probs[i])
+            or not np.isclose(scores["b_prob"], b_probs[i])
+        ):
+            mismatches += 1
+            print("MISMATCH:", texts[i], scores)
+
+    print(f"{name}: {mismatches} mismatches")
+
+
+print(f"Rows: {len(texts)}")
+print(f"Hallucination flagged: {int(h_preds.sum())}, bias flagged: {int(b_preds.sum())}")
+
+for name, (featurizer, scorer) in fused_scorers.items():
+    check(name, featurizer, scorer)
+
+
+# Two-class type heads have a single coef_ row; fit some on labels
+# collapsed from the real type predictions and check them as well.
+h_two = np.where(h_types == h_types[0], "first", "other")
+b_two = np.where(b_types == b_types[0], "first", "other")
+
+two_class_h = LogisticRegression(max_iter=2000).fit(X, h_two)
+two_class_b = LogisticRegression(max_iter=2000).fit(X, b_two)
+
+two_class_scorer = FusedScorer.from_models(
+    hallucination_flag_model,
+    two_class_h,
+    bias_flag_model,
+    two_class_b
+)
+
+expected_h_two = two_class_h.predict(X)
+expected_b_two = two_class_b.predict(X)
+
+two_class_mismatches = sum(
+    1
+    for i, scores in enumerate(two_class_scorer.score(X))
+    if scores["h_type_pred"] != (expected_h_two[i] if h_preds[i] else "none")
+    or scores["b_type_pred"] != (expected_b_two[i] if b_preds[i] else "none")
+)
+
+print(f"two-class type heads: {two_class_mismatches} mismatches")
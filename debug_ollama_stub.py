@@ -0,0 +1,96 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Stub of the Ollama /api/generate streaming endpoint
+JUDGMENT = {
+    "verdict": "false",
+    "reasoning": "The whole brain is active over a day.",
+    "corrected_statement": "Humans use virtually all of their brain.",
+    "bias": "no",
+    "bias_type": "none"
+}
+
+
+class StubOllama(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        print("REQUEST:", body["model"], body["format"], body["keep_alive"])
+
+        text = json.dumps(JUDGMENT)
+
+        if "rambling" in body["prompt"]:
+            # Prose after the object, one slow token at a time
+            text += " I hope this helps!" * 50
+        elif "garbled" in body["prompt"]:
+            text = '{"verdict": false true, "reasoning": "' + "x" * 400
+        elif "nulls" in body["prompt"]:
+            # Common llama3 output: null optional fields
+            text = json.dumps({
+                "verdict": "true",
+                "corrected_statement": None,
+                "bias": "no",
+                "bias_type": None
+            })
+
+        pieces = [text[i:i + 8] for i in range(0, len(text), 8)]
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        written = 0
+
+        try:
+            for p in pieces:
+                self.send_line({"response": p, "done": False})
+                written += 1
+                time.sleep(0.01)
+
+            self.send_line({"response": "", "done": True})
+            self.wfile.write(b"0\r\n\r\n")
+
+        except (BrokenPipeError, ConnectionResetError):
+            print(f"  stub: stream closed by client, {written}/{len(pieces)} pieces written")
+
+    def send_line(self, data):
+
+        line = (json.dumps(data) + "\n").encode()
+        self.wfile.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), StubOllama)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+
+os.environ["OLLAMA_URL"] = f"http://127.0.0.1:{server.server_port}"
+
+import ollama_reasoner
+
+print(ollama_reasoner.ollama_judge("The brain uses only ten percent"))
+print(ollama_reasoner.ollama_judge("Women are bad drivers"))
+
+# Null optional fields are normalized, not treated as malformed
+print(ollama_reasoner.ollama_judge("nulls statement"))
+
+# Trailing prose is not waited for; malformed output fails fast
+for statement in ["rambling statement", "garbled statement"]:
+    start = time.perf_counter()
+    print(ollama_reasoner.ollama_judge(statement))
+    print(f"  {time.perf_counter() - start:.2f}s")
+
+# Daemon absent and no CLI: clean fallback
+ollama_reasoner.OLLAMA_URL = "http://127.0.0.1:9"
+ollama_reasoner.OLLAMA_CLI = None
+
+print(ollama_reasoner.ollama_judge("The brain uses only ten percent"))
@@ -0,0 +1,64 @@
+import json
+import os
+import tempfile
+
+from build_wikidata_store import build_store
+from wikidata_store import WikidataStore
+
+
+def item(entity_id, label, aliases=(), sitelinks=0, **claims):
+
+    return {
+        "type": "item",
+        "id": entity_id,
+        "labels": {"en": {"language": "en", "value": label}},
+        "aliases": {"en": [{"language": "en", "value": a} for a in aliases]},
+        "sitelinks": {f"site{i}": {} for i in range(sitelinks)},
+        "claims": {
+            property_id: [
+                {"mainsnak": {"datavalue": {"value": value}}}
+            ]
+            for property_id, value in claims.items()
+        }
+    }
+
+
+# Small fixture in the dump layout: a JSON array, one entity per line
+FIXTURE = [
+    item("Q668", "India", aliases=["Bharat"], sitelinks=300,
+         P36={"id": "Q987"}, P2046={"amount": "+3287263", "unit": "km2"}),
+    item("Q987", "New Delhi", sitelinks=200),
+    item("Q937", "Albert Einstein", aliases=["Einstein"], sitelinks=250,
+         P19={"id": "Q3012"}, P20={"id": "Q138518"},
+         P569={"time": "+1879-03-14T00:00:00Z"}, P31={"id": "Q5"}),
+    item("Q3012", "Ulm"),
+    item("Q138518", "Princeton"),
+    item("Q1", "India", sitelinks=1)
+]
+
+tmp = tempfile.mkdtemp()
+dump_path = os.path.join(tmp, "fixture.json")
+store_path = os.path.join(tmp, "wikidata_store.sqlite3")
+
+with open(dump_path, "w", encoding="utf-8") as f:
+    f.write("[\n")
+    f.write(",\n".join(json.dumps(e) for e in FIXTURE))
+    f.write("\n]\n")
+
+print("Stored:", build_store(dump_path, store_path))
+
+store = WikidataStore(store_path)
+
+print(store.search("india"))
+print(store.search("Bharat"))
+print(store.entity("Q668"))
+print(store.entity("Q937"))
+
+# Serve evidence_wikidata from the store (no network)
+from evidence_wikidata import set_offline_store
+from evidence_wikidata import query_wikidata_capital, query_wikidata_deathplace
+
+set_offline_store(store_path)
+
+print(query_wikidata_capital("India"))
+print(query_wikidata_deathplace("Albert Einstein"))
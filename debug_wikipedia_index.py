@@ -0,0 +1,77 @@
+import os
+import tempfile
+
+from build_wikipedia_index import build_index
+from wikipedia_index import WikipediaIndex
+
+# Small fixture in the enwiki abstract dump layout
+FIXTURE = """<feed>
+<doc>
+<title>Wikipedia: India</title>
+<url>https://en.wikipedia.org/wiki/India</url>
+<abstract>India is a country in South Asia. It has 28 states and 8 union territories.</abstract>
+</doc>
+<doc>
+<title>Wikipedia: Union territory</title>
+<url>https://en.wikipedia.org/wiki/Union_territory</url>
+<abstract>A union territory is an administrative division of India ruled by the Union Government.</abstract>
+</doc>
+<doc>
+<title>Wikipedia: Albert Einstein</title>
+<url>https://en.wikipedia.org/wiki/Albert_Einstein</url>
+<abstract>Albert Einstein was a German-born theoretical physicist.</abstract>
+</doc>
+<doc>
+<title>Wikipedia: Red meat</title>
+<url>https://en.wikipedia.org/wiki/Red_meat</url>
+<abstract>Red meat is meat that is red when raw.</abstract>
+</doc>
+<doc>
+<title>Wikipedia: Red Meat</title>
+<url>https://en.wikipedia.org/wiki/Red_Meat</url>
+<abstract>Red Meat is a comic strip by Max Cannon.</abstract>
+</doc>
+<doc>
+<title>Wikipedia: India</title>
+<url>https://en.wikipedia.org/wiki/India</url>
+<abstract>Duplicate record, ignored.</abstract>
+</doc>
+</feed>
+"""
+
+REDIRECTS = "Einstein\tAlbert Einstein\n"
+
+tmp = tempfile.mkdtemp()
+abstracts_path = os.path.join(tmp, "abstracts.xml")
+redirects_path = os.path.join(tmp, "redirects.tsv")
+index_path = os.path.join(tmp, "wikipedia_index.sqlite3")
+
+with open(abstracts_path, "w", encoding="utf-8") as f:
+    f.write(FIXTURE)
+
+with open(redirects_path, "w", encoding="utf-8") as f:
+    f.write(REDIRECTS)
+
+print("Indexed:", build_index(abstracts_path, index_path, redirects_path))
+
+index = WikipediaIndex(index_path)
+
+print(index.lookup("india"))
+print(index.lookup("Einstein"))
+
+# Titles differing in case after the first letter are distinct pages;
+# other casings fall back to a case-insensitive match
+print([index.lookup(title)["url"] for title in ["Red meat", "Red Meat", "red meat", "RED MEAT"]])
+print(index.lookup("albert einstein")["title"], index.lookup("einstein")["title"])
+print([hit["title"] for hit in index.search("India Union Territory")])
+
+# Only some words match any page: no hit rather than an unrelated one
+print([hit["title"] for hit in index.search("India is the largest exporter of tea")])
+
+# Serve evidence_wikipedia from the index (no network)
+from evidence_wikipedia import set_offline_index, query_wikipedia_summary
+
+set_offline_index(index_path)
+
+print(query_wikipedia_summary("India Union Territory"))
+print(query_wikipedia_summary("Hitler"))
@@ -1,8 +1,9 @@
 from pipeline import run_pipeline
 from data_preprocessing import load_dataset
+from llm_gate import llm_gate_stats
 
 def evaluate_accuracy():
-    df = load_dataset()
+    df = load_dataset(columns=["ai_response", "label_hallucination"])
 
     total = 0
     correct = 0
@@ -29,6 +30,12 @@ def evaluate_accuracy():
     print("==============================")
     print(f"Correct Predictions: {correct}/{total}")
     print(f"Accuracy: {accuracy * 100:.2f}%")
+    print("==============================")
+
+    gate = llm_gate_stats()
+    print(f"LLM band: {gate['band']}")
+    print(f"LLM calls: {gate['invoked']}/{gate['eligible']} (skip rate {gate['skip_rate'] * 100:.1f}%)")
+    print(f"LLM agreement with ML flag: {gate['agreement_rate'] * 100:.1f}%")
     print("==============================\n")
 
 
@@ -1,7 +1,7 @@
 from pipeline import run_pipeline
 from data_preprocessing import load_dataset
 
-df = load_dataset()
+df = load_dataset(columns=["ai_response", "label_bias"])
 
 correct = 0
 total = 0
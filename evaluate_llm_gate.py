@@ -0,0 +1,86 @@
+from pipeline import prepare_input, score_texts, NOT_APPLICABLE_TYPES
+from data_preprocessing import load_dataset
+
+# Statements scored above `high` are trusted to the ML flag without
+# asking the LLM; [0.5, high] is the uncertainty band it still sees.
+CANDIDATE_HIGHS = [1.0, 0.95, 0.9, 0.85, 0.8, 0.75, 0.7, 0.65, 0.6, 0.55]
+
+# Minimum ML precision required on the statements the gate skips
+TARGET_PRECISION = 0.9
+
+
+def collect_scores():
+    df = load_dataset(columns=["ai_response", "label_hallucination"])
+
+    texts = []
+    labels = []
+
+    for _, row in df.iterrows():
+        ctx = prepare_input(row["ai_response"])
+
+        if ctx.statement_type in NOT_APPLICABLE_TYPES:
+            continue
+
+        texts.append(ctx.text)
+
+        # Ground truth: 1 and 2 both mean hallucination
+        labels.append(row["label_hallucination"] in [1, 2])
+
+    scores = score_texts(texts)
+
+    return [s["h_prob"] for s in scores], labels
+
+
+def evaluate_band(h_probs, labels, low, high):
+    """
+    Among statements the ML model flags (the ones that may reach the
+    LLM), returns (llm_rate, skipped, precision on skipped).
+    """
+
+    flagged = [
+        (p, y)
+        for p, y in zip(h_probs, labels)
+        if p >= 0.5
+    ]
+
+    if not flagged:
+        return 0.0, 0, 1.0
+
+    skipped = [y for p, y in flagged if not (low <= p <= high)]
+    llm_calls = len(flagged) - len(skipped)
+
+    precision = sum(skipped) / len(skipped) if skipped else 1.0
+
+    return llm_calls / len(flagged), len(skipped), precision
+
+
+def tune_llm_gate():
+    h_probs, labels = collect_scores()
+
+    print("\n==============================")
+    print("LLM UNCERTAINTY BAND TUNING")
+    print("==============================")
+    print(f"{'band':>14} {'LLM rate':>9} {'skipped':>8} {'precision':>10}")
+
+    best = None
+
+    for high in CANDIDATE_HIGHS:
+        llm_rate, skipped, precision = evaluate_band(h_probs, labels, 0.5, high)
+
+        print(f"{f'0.50-{high:.2f}':>14} {llm_rate * 100:>8.1f}% {skipped:>8} {precision * 100:>9.1f}%")
+
+        if precision >= TARGET_PRECISION:
+            best = high
+
+    print("==============================")
+
+    if best is None:
+        print("No band meets the target precision; keep LLM_UNCERTAINTY_BAND=0,1")
+    else:
+        print(f"Suggested: LLM_UNCERTAINTY_BAND=0.5,{best}")
+
+    print("==============================\n")
+
+
+if __name__ == "__main__":
+    tune_llm_gate()
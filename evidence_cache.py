@@ -0,0 +1,299 @@
+import contextvars
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import evidence_http
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Empty path disables the cache entirely.
+CACHE_PATH = os.environ.get(
+    "EVIDENCE_CACHE_PATH",
+    os.path.join(BASE_DIR, "evidence_cache.sqlite3")
+)
+
+# Offline mode: serve from the cache (stale entries included)
+# and never touch the network.
+CACHE_ONLY = os.environ.get("EVIDENCE_CACHE_ONLY", "0") == "1"
+
+DAY = 24 * 60 * 60
+
+SOURCE_TTLS = {
+    "wikipedia": 7 * DAY,
+    "wikidata": 30 * DAY
+}
+
+# Misses and 404s are cached too, but for a shorter time.
+NEGATIVE_TTL = DAY
+
+# Sources whose keys keep their case: Wikipedia titles are
+# case-sensitive after the first character ("Red Meat" vs "Red meat").
+CASE_SENSITIVE_SOURCES = {"wikipedia"}
+
+
+class PersistentCache:
+    """
+    Small SQLite key/value store shared by threads and processes.
+    Values are JSON; None is stored as a negative entry.
+    """
+
+    def __init__(self, path):
+
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self):
+
+        conn = getattr(self._local, "conn", None)
+
+        if conn is None:
+
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " source TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " PRIMARY KEY (source, key)"
+                ") WITHOUT ROWID"
+            )
+
+            self._local.conn = conn
+
+        return conn
+
+    def get(self, source, key, allow_stale=False):
+        """
+        Returns (hit, value).
+        """
+
+        try:
+            row = self._connection().execute(
+                "SELECT value, expires_at FROM entries WHERE source = ? AND key = ?",
+                (source, key)
+            ).fetchone()
+        except sqlite3.Error:
+            return False, None
+
+        if row is None:
+            return False, None
+
+        value, expires_at = row
+
+        if expires_at < time.time() and not allow_stale:
+            return False, None
+
+        return True, json.loads(value)
+
+    def set(self, source, key, value, ttl):
+
+        try:
+            conn = self._connection()
+
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (source, key, value, expires_at)"
+                    " VALUES (?, ?, ?, ?)",
+                    (source, key, json.dumps(value), time.time() + ttl)
+                )
+        except sqlite3.Error:
+            pass
+
+    def evict(self, source, max_entries):
+        """
+        Drops expired entries of source, then the ones closest to
+        expiry until at most max_entries remain.
+        """
+
+        try:
+            conn = self._connection()
+
+            with conn:
+                conn.execute(
+                    "DELETE FROM entries WHERE source = ? AND expires_at < ?",
+                    (source, time.time())
+                )
+                conn.execute(
+                    "DELETE FROM entries WHERE source = ? AND key IN ("
+                    " SELECT key FROM entries WHERE source = ?"
+                    " ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                    (source, source, max_entries)
+                )
+        except sqlite3.Error:
+            pass
+
+
+_cache = PersistentCache(CACHE_PATH) if CACHE_PATH else None
+
+# Per-request memo shared by every cached lookup: (source, key) -> value.
+_request_memo = contextvars.ContextVar("evidence_request_memo", default=None)
+
+
+# Memo marker for a lookup that failed (transport error, breaker open).
+_UNAVAILABLE = object()
+
+
+def set_cache_only(enabled=True):
+
+    global CACHE_ONLY
+    CACHE_ONLY = enabled
+
+
+@contextmanager
+def request_scope():
+    """
+    Memoizes every cached lookup for the duration of one request,
+    including ones that failed or were filled by a batch prefetch.
+    """
+
+    token = _request_memo.set({})
+
+    try:
+        yield
+    finally:
+        _request_memo.reset(token)
+
+
+def request_memo():
+    """
+    Returns the current request's memo dict, or None outside a scope.
+    """
+
+    return _request_memo.get()
+
+
+def normalize_key(value, lowercase=True):
+
+    value = " ".join(str(value).split())
+
+    return value.lower() if lowercase else value
+
+
+def cache_key(source, name, args):
+
+    lowercase = source not in CASE_SENSITIVE_SOURCES
+
+    return name + ":" + "|".join(
+        normalize_key(arg, lowercase) for arg in args
+    )
+
+
+def lookup(source, name, *args):
+    """
+    Reads what the cached lookup `name` would return for args,
+    without computing it. Returns (hit, value).
+    """
+
+    key = cache_key(source, name, args)
+    memo = request_memo()
+
+    if memo is not None and (source, key) in memo:
+
+        value = memo[(source, key)]
+
+        # Replaying a failure keeps the caller's evidence marked
+        # incomplete, as if it had made the request itself.
+        if value is _UNAVAILABLE:
+            evidence_http.record_failure()
+            return True, None
+
+        return True, value
+
+    if _cache is None:
+        return False, None
+
+    hit, value = _cache.get(source, key, allow_stale=CACHE_ONLY)
+
+    if hit and memo is not None:
+        memo[(source, key)] = value
+
+    return hit, value
+
+
+def store(source, name, args, value, failed=False):
+    """
+    Records a result for the cached lookup `name`, e.g. from a
+    batch fetch. None is stored as a negative entry, unless the
+    lookup failed: failures are only remembered for the request.
+    """
+
+    key = cache_key(source, name, args)
+    memo = request_memo()
+
+    if value is None and failed:
+
+        if memo is not None:
+            memo[(source, key)] = _UNAVAILABLE
+
+        return
+
+    if memo is not None:
+        memo[(source, key)] = value
+
+    if _cache is None:
+        return
+
+    _cache.set(
+        source,
+        key,
+        value,
+        NEGATIVE_TTL if value is None else SOURCE_TTLS[source]
+    )
+
+
+def cached(source, bypass_when=None):
+    """
+    Caches an evidence lookup persistently, keyed by the function
+    name and its normalized arguments.
+
+    A None result is cached as a negative entry, unless a transport
+    error or server failure happened while computing it.
+
+    bypass_when() returning True calls the function directly, e.g.
+    when it is served from a local offline store.
+    """
+
+    def decorator(fn):
+
+        @functools.wraps(fn)
+        def wrapper(*args):
+
+            if bypass_when is not None and bypass_when():
+                return fn(*args)
+
+            hit, value = lookup(source, fn.__name__, *args)
+
+            if hit:
+                return value
+
+            if CACHE_ONLY and _cache is not None:
+                return None
+
+            failures_before = evidence_http.transient_failure_count()
+
+            value = fn(*args)
+
+            store(
+                source,
+                fn.__name__,
+                args,
+                value,
+                failed=evidence_http.transient_failure_count() != failures_before
+            )
+
+            return value
+
+        return wrapper
+
+    return decorator
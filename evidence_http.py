@@ -0,0 +1,347 @@
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+CONNECT_TIMEOUT = float(os.environ.get("EVIDENCE_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.environ.get("EVIDENCE_READ_TIMEOUT", "10"))
+
+DEFAULT_TIMEOUT = (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+# Max in-flight requests per host, shared by every thread
+# (and therefore by every task of the async pipeline).
+HOST_CONCURRENCY = int(os.environ.get("EVIDENCE_HOST_CONCURRENCY", "8"))
+
+# Keep-alive pool size per evidence host. Anything else
+# goes through the default adapter.
+HOST_POOL_SIZES = {
+    "https://www.wikidata.org": HOST_CONCURRENCY,
+    "https://en.wikipedia.org": HOST_CONCURRENCY
+}
+
+# Circuit breaker: open a host after this many consecutive failures,
+# and fail fast for COOLDOWN seconds before letting one probe through.
+BREAKER_FAILURES = int(os.environ.get("EVIDENCE_BREAKER_FAILURES", "5"))
+BREAKER_COOLDOWN = float(os.environ.get("EVIDENCE_BREAKER_COOLDOWN", "30"))
+
+# Retries: at most MAX_RETRIES per request, full-jitter backoff, and
+# only while the shared budget has tokens. Every request earns
+# RETRY_BUDGET_RATIO tokens, so retries stay a bounded fraction of
+# traffic during an outage.
+MAX_RETRIES = int(os.environ.get("EVIDENCE_MAX_RETRIES", "2"))
+RETRY_BACKOFF_BASE = 0.25
+RETRY_BACKOFF_CAP = 2.0
+RETRY_BUDGET_RATIO = 0.1
+RETRY_BUDGET_MAX = 10.0
+
+DEFAULT_HEADERS = {
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive"
+}
+
+_host_slots = {}
+_host_slots_lock = threading.Lock()
+
+# Per-thread count of failed requests (transport errors, 429, 5xx).
+# Caches use it to avoid storing a failure as a genuine miss.
+_failures = threading.local()
+
+
+# -------------------------------------------------
+# SHARED SESSION
+# -------------------------------------------------
+def _build_session():
+
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+    session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+    for prefix, size in HOST_POOL_SIZES.items():
+        session.mount(prefix, HTTPAdapter(pool_connections=1, pool_maxsize=size))
+
+    return session
+
+
+session = _build_session()
+
+
+def transient_failure_count():
+
+    return getattr(_failures, "count", 0)
+
+
+def record_failure():
+    """
+    Marks the current thread's evidence as incomplete. Also used by
+    caches when they serve a failure memoized earlier in the request.
+    """
+
+    _failures.count = transient_failure_count() + 1
+
+
+# -------------------------------------------------
+# CIRCUIT BREAKER / RETRY BUDGET
+# -------------------------------------------------
+class CircuitBreaker:
+    """
+    Per-host breaker. Closed: requests flow. Open: fail fast until
+    open_until. After that, one probe at a time is let through;
+    success closes it, failure re-opens it.
+    """
+
+    def __init__(self):
+
+        self.failures = 0
+        self.open_until = 0.0
+        self.probing = False
+        self.lock = threading.Lock()
+
+    def allow(self):
+
+        with self.lock:
+
+            if self.open_until == 0.0:
+                return True
+
+            if time.monotonic() < self.open_until or self.probing:
+                return False
+
+            self.probing = True
+
+            return True
+
+    def record_success(self):
+
+        with self.lock:
+            self.failures = 0
+            self.open_until = 0.0
+            self.probing = False
+
+    def record_failure(self, retry_after=None):
+
+        with self.lock:
+
+            self.failures += 1
+            self.probing = False
+
+            if retry_after is not None:
+                self.open_until = max(self.open_until, time.monotonic() + retry_after)
+
+            elif self.failures >= BREAKER_FAILURES or self.open_until:
+                self.open_until = time.monotonic() + BREAKER_COOLDOWN
+
+    def state(self):
+
+        with self.lock:
+
+            if self.open_until == 0.0:
+                return "closed"
+
+            if time.monotonic() < self.open_until:
+                return "open"
+
+            return "half-open"
+
+
+class RetryBudget:
+    """
+    Token bucket shared by all hosts and threads.
+    """
+
+    def __init__(self, ratio=RETRY_BUDGET_RATIO, maximum=RETRY_BUDGET_MAX):
+
+        self.ratio = ratio
+        self.maximum = maximum
+        self.tokens = maximum
+        self.lock = threading.Lock()
+
+    def deposit(self):
+
+        with self.lock:
+            self.tokens = min(self.maximum, self.tokens + self.ratio)
+
+    def withdraw(self):
+
+        with self.lock:
+
+            if self.tokens < 1:
+                return False
+
+            self.tokens -= 1
+
+            return True
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+retry_budget = RetryBudget()
+
+
+def breaker_for(host):
+
+    with _breakers_lock:
+
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker()
+
+        return _breakers[host]
+
+
+def breaker_states():
+
+    with _breakers_lock:
+        breakers = dict(_breakers)
+
+    return {host: breaker.state() for host, breaker in breakers.items()}
+
+
+def parse_retry_after(value):
+    """
+    Retry-After header (seconds or HTTP date) -> seconds, or None.
+    """
+
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_throttled(response):
+
+    # Wikidata answers maxlag with HTTP 200 and an error header.
+    return (
+        response.status_code in (429, 503)
+        or response.headers.get("MediaWiki-API-Error") == "maxlag"
+    )
+
+
+def host_slot(url):
+    """
+    Returns the semaphore that bounds concurrent requests to the host of url.
+    """
+
+    host = urlsplit(url).netloc
+
+    with _host_slots_lock:
+
+        if host not in _host_slots:
+            _host_slots[host] = threading.BoundedSemaphore(HOST_CONCURRENCY)
+
+        return _host_slots[host]
+
+
+def http_get(url, params=None, headers=None, timeout=None):
+    """
+    GET through the shared keep-alive session, under the
+    per-host concurrency limit and circuit breaker.
+
+    Transport errors, 5xx, 429 and maxlag answers are retried with
+    jitter while the retry budget allows; Retry-After is honoured.
+    Returns the last response, or None on a transport error or when
+    the host's breaker is open. Failures are counted per thread
+    (see transient_failure_count).
+    """
+
+    host = urlsplit(url).netloc
+    breaker = breaker_for(host)
+
+    retry_budget.deposit()
+
+    attempt = 0
+
+    while True:
+
+        if not breaker.allow():
+            record_failure()
+            return None
+
+        retry_after = None
+
+        with host_slot(url):
+
+            try:
+                response = session.get(
+                    url,
+                    params=params,
+                    headers=headers,
+                    timeout=timeout or DEFAULT_TIMEOUT
+                )
+            except requests.RequestException:
+                response = None
+
+        if response is not None and response.status_code < 500 and not _is_throttled(response):
+            breaker.record_success()
+            return response
+
+        if response is not None and _is_throttled(response):
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+
+        breaker.record_failure(retry_after)
+
+        if (
+            attempt >= MAX_RETRIES
+            or (retry_after is not None and retry_after > RETRY_BACKOFF_CAP)
+            or not retry_budget.withdraw()
+        ):
+            record_failure()
+            return response
+
+        attempt += 1
+
+        time.sleep(
+            retry_after
+            if retry_after is not None
+            else random.uniform(0, min(RETRY_BACKOFF_CAP, RETRY_BACKOFF_BASE * 2 ** attempt))
+        )
+
+
+def pool_stats():
+    """
+    Connection pool statistics per host.
+
+    connections_opened counts new TCP/TLS connections, so
+    requests - connections_opened is the number of reused ones.
+    """
+
+    stats = {}
+
+    for adapter in set(session.adapters.values()):
+
+        pools = adapter.poolmanager.pools
+
+        for key in pools.keys():
+
+            pool = pools.get(key)
+
+            if pool is None:
+                continue
+
+            stats[f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+                "requests": pool.num_requests,
+                "connections_opened": pool.num_connections,
+                "idle_connections": sum(
+                    1 for conn in list(pool.pool.queue) if conn is not None
+                ) if pool.pool else 0,
+                "max_size": pool.pool.maxsize if pool.pool else 0
+            }
+
+    return stats
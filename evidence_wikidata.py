@@ -1,4 +1,13 @@
-import requests
+import contextvars
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import evidence_cache
+from evidence_cache import cached
+from evidence_http import HOST_CONCURRENCY, http_get
+from wikidata_store import WikidataStore
 
 WIKIDATA_API = "https://www.wikidata.org/w/api.php"
 
@@ -6,61 +15,349 @@ HEADERS = {
     "User-Agent": "DSC-Hackathon-Hallucination-Detector/1.0 (contact: student-project)"
 }
 
+# Seconds of replication lag above which Wikidata asks us to retry.
+WIKIDATA_MAXLAG = 5
+
+# wbgetentities accepts at most 50 ids per request.
+ENTITY_BATCH_SIZE = 50
+
+# Only what the verifiers read: claims and English labels.
+ENTITY_PROPS = "labels|claims"
+ENTITY_LANGUAGES = "en"
+
+# Max parsed entity records kept in process memory.
+ENTITY_CACHE_SIZE = int(os.environ.get("WIKIDATA_ENTITY_CACHE_SIZE", "1024"))
+
+_entity_cache = OrderedDict()
+_entity_inflight = {}
+_entity_lock = threading.Lock()
+
+# Offline store built by build_wikidata_store.py. When present it
+# serves every lookup and the network is never used.
+WIKIDATA_STORE_PATH = os.environ.get("WIKIDATA_STORE_PATH", "")
+
+# Key of parsed entity records in the per-request evidence memo.
+ENTITY_MEMO_SOURCE = "wikidata-entity"
+
+# Entity searches of a prefetch run side by side; http_get still
+# caps in-flight requests to the host at HOST_CONCURRENCY.
+_search_pool = ThreadPoolExecutor(
+    max_workers=HOST_CONCURRENCY,
+    thread_name_prefix="wikidata-search"
+)
+
+
+_store = (
+    WikidataStore(WIKIDATA_STORE_PATH)
+    if WIKIDATA_STORE_PATH and os.path.exists(WIKIDATA_STORE_PATH)
+    else None
+)
+
+
+def set_offline_store(path):
+    """
+    Serves all lookups from the store at path (None to go online).
+    """
+
+    global _store
+    _store = WikidataStore(path) if path else None
+
+    with _entity_lock:
+        _entity_cache.clear()
+
+
+def using_offline_store():
+
+    return _store is not None
+
+
 def safe_get_json(url, params=None):
-    try:
-        response = requests.get(url, params=params, headers=HEADERS, timeout=10)
 
-        if response.status_code != 200:
-            return None
+    # Back off while Wikidata replication lag is high.
+    if url == WIKIDATA_API:
+        params = {**(params or {}), "maxlag": WIKIDATA_MAXLAG}
 
+    response = http_get(url, params=params, headers=HEADERS)
+
+    if response is None or response.status_code != 200:
+        return None
+
+    try:
         return response.json()
-    except:
+    except ValueError:
         return None
 
 
-def query_wikidata_capital(country):
+# -------------------------------------------------
+# ENTITY DOCUMENTS
+# -------------------------------------------------
+def _snak_value(statement):
+
+    try:
+        value = statement["mainsnak"]["datavalue"]["value"]
+    except (KeyError, TypeError):
+        return None
+
+    if isinstance(value, dict):
+
+        if "id" in value:
+            return value["id"]
+
+        if "time" in value:
+            return value["time"]
+
+        if "amount" in value:
+            return value["amount"]
+
+        return None
+
+    return value
+
+
+def compact_entity(entity_id, entity):
     """
-    Returns capital of a country using Wikidata.
-    Fails safely (returns None).
+    Reduces a full Wikidata entity to the fields the verifiers read:
+    {"id", "label", "claims": {property_id: [value, ...]}}.
+    Item values are Q-ids, times are ISO strings, quantities amounts.
     """
 
-    search_params = {
-        "action": "wbsearchentities",
-        "search": country,
-        "language": "en",
+    label = (
+        entity.get("labels", {})
+        .get("en", {})
+        .get("value")
+    )
+
+    claims = {
+        property_id: [_snak_value(statement) for statement in statements]
+        for property_id, statements in entity.get("claims", {}).items()
+    }
+
+    return {
+        "id": entity_id,
+        "label": label,
+        "claims": claims
+    }
+
+
+def _fetch_entities(entity_ids):
+    """
+    Fetches compact records for up to ENTITY_BATCH_SIZE ids in one
+    wbgetentities call, filtered to ENTITY_PROPS / ENTITY_LANGUAGES.
+    Returns {entity_id: record}; missing or failed ids are absent.
+    """
+
+    if _store is not None:
+        return _store.entities(entity_ids)
+
+    params = {
+        "action": "wbgetentities",
+        "ids": "|".join(entity_ids),
+        "props": ENTITY_PROPS,
+        "languages": ENTITY_LANGUAGES,
         "format": "json"
     }
 
-    search_data = safe_get_json(WIKIDATA_API, search_params)
-    if not search_data or not search_data.get("search"):
-        return None
+    data = safe_get_json(WIKIDATA_API, params)
 
-    country_id = search_data["search"][0]["id"]
+    if not data or not data.get("entities"):
+        return {}
 
-    entity_url = f"https://www.wikidata.org/wiki/Special:EntityData/{country_id}.json"
-    entity_data = safe_get_json(entity_url)
+    records = {}
 
-    if not entity_data:
-        return None
+    for key, entity in data["entities"].items():
 
-    claims = entity_data["entities"][country_id].get("claims", {})
+        if "missing" in entity:
+            continue
 
-    # P36 = capital
-    if "P36" not in claims:
-        return None
+        # Redirected items come back under their target id.
+        requested_id = entity.get("redirects", {}).get("from", key)
+
+        records[requested_id] = compact_entity(requested_id, entity)
+
+    return records
+
+
+def _fetch_entity(entity_id):
+
+    return _fetch_entities([entity_id]).get(entity_id)
+
+
+def _remember_entity(entity_id, record):
+
+    with _entity_lock:
+
+        _entity_cache[entity_id] = record
+        _entity_cache.move_to_end(entity_id)
+
+        while len(_entity_cache) > ENTITY_CACHE_SIZE:
+            _entity_cache.popitem(last=False)
+
+
+def get_entity_document(entity_id):
+    """
+    Returns the compact record for entity_id, or None.
+
+    Served from the request scope, then the process-wide LRU;
+    concurrent requests for the same id share one fetch.
+    """
+
+    scope = evidence_cache.request_memo()
+
+    if scope is not None and (ENTITY_MEMO_SOURCE, entity_id) in scope:
+        return scope[(ENTITY_MEMO_SOURCE, entity_id)]
+
+    owner = False
+
+    with _entity_lock:
+
+        if entity_id in _entity_cache:
+
+            _entity_cache.move_to_end(entity_id)
+            record = _entity_cache[entity_id]
+
+            if scope is not None:
+                scope[(ENTITY_MEMO_SOURCE, entity_id)] = record
+
+            return record
+
+        future = _entity_inflight.get(entity_id)
+
+        if future is None:
+            future = Future()
+            _entity_inflight[entity_id] = future
+            owner = True
+
+    if owner:
+
+        try:
+            record = _fetch_entity(entity_id)
+
+            if record is not None:
+                _remember_entity(entity_id, record)
+
+            future.set_result(record)
+
+        except Exception as e:
+            future.set_exception(e)
+            raise
+
+        finally:
+            with _entity_lock:
+                _entity_inflight.pop(entity_id, None)
+
+    record = future.result()
+
+    if scope is not None:
+        scope[(ENTITY_MEMO_SOURCE, entity_id)] = record
+
+    return record
+
+
+def prefetch_entities(entity_ids):
+    """
+    Loads every id not yet in the request scope or LRU with as few
+    wbgetentities calls as possible.
+    """
+
+    if evidence_cache.CACHE_ONLY and _store is None:
+        return
+
+    scope = evidence_cache.request_memo()
+
+    missing = []
+
+    with _entity_lock:
+
+        for entity_id in dict.fromkeys(entity_ids):
+
+            if not entity_id:
+                continue
+
+            if scope is not None and (ENTITY_MEMO_SOURCE, entity_id) in scope:
+                continue
+
+            if entity_id in _entity_cache:
+                continue
+
+            missing.append(entity_id)
+
+    for start in range(0, len(missing), ENTITY_BATCH_SIZE):
+
+        records = _fetch_entities(missing[start:start + ENTITY_BATCH_SIZE])
+
+        for entity_id, record in records.items():
+
+            _remember_entity(entity_id, record)
 
-    capital_id = claims["P36"][0]["mainsnak"]["datavalue"]["value"]["id"]
+            if scope is not None:
+                scope[(ENTITY_MEMO_SOURCE, entity_id)] = record
 
-    capital_entity_url = f"https://www.wikidata.org/wiki/Special:EntityData/{capital_id}.json"
-    capital_data = safe_get_json(capital_entity_url)
 
-    if not capital_data:
+def prefetch_claim_targets(lookups):
+    """
+    Batch-resolves (name, property_id) lookups, e.g. ("India", "P36"):
+    one search per distinct name, run concurrently, then one batched
+    fetch for all the subject entities and one for all the target
+    entities' labels.
+    Later per-claim lookups are then served from the caches.
+    """
+
+    names = list(dict.fromkeys(name for name, _ in lookups))
+
+    if len(names) > 1 and not using_offline_store():
+
+        # Each search runs in a copy of this context, so its result
+        # (or failure) lands in the caller's request memo.
+        searches = [
+            _search_pool.submit(contextvars.copy_context().run, search_entity_id, name)
+            for name in names
+        ]
+
+        subject_ids = dict(zip(names, (search.result() for search in searches)))
+
+    else:
+        subject_ids = {name: search_entity_id(name) for name in names}
+
+    prefetch_entities(subject_ids.values())
+
+    target_ids = [
+        get_entity_claim(subject_ids[name], property_id)
+        for name, property_id in lookups
+        if subject_ids[name]
+    ]
+
+    prefetch_entities(target_ids)
+
+
+# -------------------------------------------------
+# LOOKUPS
+# -------------------------------------------------
+@cached("wikidata", bypass_when=using_offline_store)
+def query_wikidata_capital(country):
+    """
+    Returns capital of a country using Wikidata.
+    Fails safely (returns None).
+    """
+
+    country_id = search_entity_id(country)
+
+    if not country_id:
+        return None
+
+    # P36 = capital
+    capital_id = get_entity_claim(country_id, "P36")
+
+    if not capital_id:
         return None
 
-    return capital_data["entities"][capital_id]["labels"]["en"]["value"]
+    return get_entity_label(capital_id)
 
+@cached("wikidata", bypass_when=using_offline_store)
 def search_entity_id(name):
 
+    if _store is not None:
+        return _store.search(name)
+
     params = {
         "action": "wbsearchentities",
         "search": name,
@@ -81,57 +378,36 @@ def search_entity_id(name):
 
     return data["search"][0]["id"]
 
+@cached("wikidata", bypass_when=using_offline_store)
 def get_entity_claim(entity_id, property_id):
 
-    entity_url = (
-        f"https://www.wikidata.org/wiki/"
-        f"Special:EntityData/{entity_id}.json"
-    )
-
-    data = safe_get_json(entity_url)
+    record = get_entity_document(entity_id)
 
-    if not data:
+    if not record:
         return None
 
-    claims = (
-        data["entities"][entity_id]
-        .get("claims", {})
-    )
+    values = record["claims"].get(property_id)
 
-    if property_id not in claims:
+    if not values:
         return None
 
-    try:
-
-        target_id = (
-            claims[property_id][0]
-            ["mainsnak"]
-            ["datavalue"]
-            ["value"]
-            ["id"]
-        )
+    target_id = values[0]
 
-        return target_id
-
-    except:
+    # Only item-valued claims resolve to an entity id.
+    if not isinstance(target_id, str) or not target_id.startswith("Q"):
         return None
+
+    return target_id
     
+@cached("wikidata", bypass_when=using_offline_store)
 def get_entity_label(entity_id):
 
-    entity_url = (
-        f"https://www.wikidata.org/wiki/"
-        f"Special:EntityData/{entity_id}.json"
-    )
-
-    data = safe_get_json(entity_url)
+    record = get_entity_document(entity_id)
 
-    if not data:
+    if not record:
         return None
 
-    return (
-        data["entities"][entity_id]
-        ["labels"]["en"]["value"]
-    )
+    return record["label"]
 
 def query_wikidata_deathplace(person):
 
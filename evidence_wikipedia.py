@@ -1,31 +1,88 @@
-import requests
+import os
+
+import evidence_cache
+import evidence_http
+from evidence_cache import cached
+from evidence_http import http_get
+from wikipedia_index import WikipediaIndex
 
 WIKI_API = "https://en.wikipedia.org/api/rest_v1/page/summary/"
+WIKI_ACTION_API = "https://en.wikipedia.org/w/api.php"
+
+HEADERS = {
+    "User-Agent":
+    "RAV-Hallucination-Detector/1.0"
+}
+
+# prop=extracts with exintro returns at most 20 pages per request.
+SUMMARY_BATCH_SIZE = 20
+
+# Local abstract index built by build_wikipedia_index.py. When
+# present it serves every lookup and the network is never used.
+WIKIPEDIA_INDEX_PATH = os.environ.get("WIKIPEDIA_INDEX_PATH", "")
+
+_index = (
+    WikipediaIndex(WIKIPEDIA_INDEX_PATH)
+    if WIKIPEDIA_INDEX_PATH and os.path.exists(WIKIPEDIA_INDEX_PATH)
+    else None
+)
+
+
+def first_paragraph(extract):
+    """
+    First non-empty paragraph of a plain-text extract. The REST
+    summary and the batch (exintro) endpoint return one and several
+    lead paragraphs; both are cut to this so claim checks see the
+    same evidence text whichever path filled the cache.
+    """
+
+    for paragraph in (extract or "").split("\n"):
+
+        paragraph = paragraph.strip()
+
+        if paragraph:
+            return paragraph
+
+    return ""
+
+
+def set_offline_index(path):
+    """
+    Serves all lookups from the index at path (None to go online).
+    """
+
+    global _index
+    _index = WikipediaIndex(path) if path else None
+
+
+def using_offline_index():
+
+    return _index is not None
 
 
+@cached("wikipedia", bypass_when=using_offline_index)
 def query_wikipedia_summary(query):
 
+    if _index is not None:
+        return _index.summary(query)
+
     try:
 
         url = WIKI_API + query.replace(" ", "_")
 
-        response = requests.get(
+        response = http_get(
             url,
-            timeout=10,
-            headers={
-                "User-Agent":
-                "RAV-Hallucination-Detector/1.0"
-            }
+            headers=HEADERS
         )
 
-        if response.status_code != 200:
+        if response is None or response.status_code != 200:
             return None
 
         data = response.json()
 
         return {
             "title": data.get("title", query),
-            "text": data.get("extract", ""),
+            "text": first_paragraph(data.get("extract", "")),
             "source": "Wikipedia",
             "url": data.get("content_urls", {})
                       .get("desktop", {})
@@ -36,4 +93,156 @@ def query_wikipedia_summary(query):
 
         print("WIKI API ERROR:", e)
 
-        return None
\ No newline at end of file
+        return None
+
+
+def _fetch_summaries(queries):
+    """
+    One action=query call for up to SUMMARY_BATCH_SIZE titles.
+    Returns {query: record or None}, or None if the request failed.
+    """
+
+    params = {
+        "action": "query",
+        "prop": "extracts|info",
+        "exintro": 1,
+        "explaintext": 1,
+        "exlimit": SUMMARY_BATCH_SIZE,
+        "inprop": "url",
+        "redirects": 1,
+        "titles": "|".join(queries),
+        "format": "json",
+        "formatversion": 2
+    }
+
+    response = http_get(WIKI_ACTION_API, params=params, headers=HEADERS)
+
+    if response is None or response.status_code != 200:
+        return None
+
+    try:
+        data = response.json()["query"]
+    except (ValueError, KeyError):
+        return None
+
+    normalized = {
+        item["from"]: item["to"]
+        for item in data.get("normalized", [])
+    }
+
+    redirects = {
+        item["from"]: item["to"]
+        for item in data.get("redirects", [])
+    }
+
+    pages = {
+        page["title"]: page
+        for page in data.get("pages", [])
+        if not page.get("missing") and not page.get("invalid")
+    }
+
+    results = {}
+
+    for query in queries:
+
+        title = normalized.get(query, query)
+        title = redirects.get(title, title)
+
+        page = pages.get(title)
+
+        if page is None:
+            results[query] = None
+            continue
+
+        results[query] = {
+            "title": page["title"],
+            "text": first_paragraph(page.get("extract", "")),
+            "source": "Wikipedia",
+            "url": page.get("fullurl", "")
+        }
+
+    return results
+
+
+def query_wikipedia_summaries(queries):
+    """
+    Batch variant of query_wikipedia_summary.
+
+    Fetches intro extracts for many titles per request, follows
+    redirects and maps results back to the original queries.
+    Returns {query: {title, text, source, url} or None}. Results
+    also warm the query_wikipedia_summary caches.
+
+    Queries of a batch the API rejected (error payload, 414 for a
+    long titles= list) are left out of the result and of the caches,
+    so query_wikipedia_summary resolves them one by one.
+    """
+
+    if _index is not None:
+        return {
+            query: _index.summary(query)
+            for query in queries
+        }
+
+    results = {}
+    missing = []
+
+    for query in dict.fromkeys(queries):
+
+        hit, value = evidence_cache.lookup(
+            "wikipedia", "query_wikipedia_summary", query
+        )
+
+        if hit:
+            results[query] = value
+        else:
+            missing.append(query)
+
+    if evidence_cache.CACHE_ONLY:
+
+        for query in missing:
+            results[query] = None
+
+        return results
+
+    for start in range(0, len(missing), SUMMARY_BATCH_SIZE):
+
+        chunk = missing[start:start + SUMMARY_BATCH_SIZE]
+        failures_before = evidence_http.transient_failure_count()
+
+        fetched = _fetch_summaries(chunk)
+        failed = evidence_http.transient_failure_count() != failures_before
+
+        if fetched is None:
+
+            # Only a transient failure makes the evidence unavailable
+            if not failed:
+                continue
+
+            for query in chunk:
+
+                results[query] = None
+
+                evidence_cache.store(
+                    "wikipedia",
+                    "query_wikipedia_summary",
+                    (query,),
+                    None,
+                    failed=True
+                )
+
+            continue
+
+        for query, record in fetched.items():
+
+            results[query] = record
+
+            evidence_cache.store(
+                "wikipedia",
+                "query_wikipedia_summary",
+                (query,),
+                record,
+                failed=failed
+            )
+
+    return results
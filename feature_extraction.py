@@ -1,4 +1,6 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, TfidfVectorizer
+
+from featurizers import DEFAULT_HASHING_FEATURES, HashingTfidfVectorizer
 
 def build_tfidf_features(
     texts,
@@ -19,3 +21,38 @@ def build_tfidf_features(
 
     X_tfidf = vectorizer.fit_transform(texts)
     return vectorizer, X_tfidf
+
+
+def hashing_featurizer(
+    n_features=DEFAULT_HASHING_FEATURES,
+    ngram_range=(1, 2),
+    min_df=2
+):
+    """
+    Unfitted HashingTfidfVectorizer with the build_tfidf_features
+    analyzer settings.
+    """
+
+    return HashingTfidfVectorizer(
+        n_features=n_features,
+        stop_words=ENGLISH_STOP_WORDS,
+        ngram_range=ngram_range,
+        min_df=min_df
+    )
+
+
+def build_hashing_features(
+    texts,
+    n_features=DEFAULT_HASHING_FEATURES,
+    ngram_range=(1, 2),
+    min_df=2
+):
+    """
+    Same analyzer and weighting as build_tfidf_features, but terms
+    are hashed into n_features buckets instead of a vocabulary.
+    """
+
+    vectorizer = hashing_featurizer(n_features, ngram_range, min_df)
+
+    X_hashed = vectorizer.fit_transform(list(texts))
+    return vectorizer, X_hashed
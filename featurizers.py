@@ -0,0 +1,231 @@
+import re
+import zlib
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+# -------------------------------------------------
+# ARRAY-BACKED TF-IDF FEATURIZERS
+# -------------------------------------------------
+# Both featurizers reproduce the sklearn word analyzer and TF-IDF
+# weighting with numpy arrays only, so they can be served from a
+# memory-mapped export without sklearn:
+#
+#   ArrayTfidfVectorizer    fitted vocabulary, column = position
+#                           in the sorted vocabulary array
+#   HashingTfidfVectorizer  no vocabulary, column = crc32(term)
+#                           modulo n_features
+#
+# crc32 rather than hash(): Python's string hash is salted per
+# process, the columns must be identical in every worker.
+
+DEFAULT_TOKEN_PATTERN = r"(?u)\b\w\w+\b"
+
+DEFAULT_HASHING_FEATURES = 2 ** 20
+
+
+class ArrayTfidfVectorizer:
+    """
+    TfidfVectorizer.transform() over exported arrays. Terms are
+    looked up with np.searchsorted in the sorted vocabulary array
+    instead of a dict, so the vocabulary can stay memory-mapped.
+    """
+
+    def __init__(self, vocabulary, idf, stop_words, token_pattern,
+                 ngram_range=(1, 1), lowercase=True, norm="l2",
+                 sublinear_tf=False):
+
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.stop_words = frozenset(str(word) for word in stop_words)
+        self.token_pattern = re.compile(token_pattern)
+        self.ngram_range = tuple(ngram_range)
+        self.lowercase = lowercase
+        self.norm = norm
+        self.sublinear_tf = sublinear_tf
+
+        if norm not in ("l2", None):
+            raise ValueError(f"Unsupported norm: {norm}")
+
+    @property
+    def n_features(self) -> int:
+
+        return len(self.vocabulary)
+
+    def analyze(self, text):
+        """
+        Same terms as the sklearn word analyzer: tokens, stop words
+        removed, then n-grams joined by single spaces.
+        """
+
+        if self.lowercase:
+            text = text.lower()
+
+        tokens = [
+            token
+            for token in self.token_pattern.findall(text)
+            if token not in self.stop_words
+        ]
+
+        min_n, max_n = self.ngram_range
+
+        terms = list(tokens) if min_n == 1 else []
+
+        for n in range(max(min_n, 2), min(max_n, len(tokens)) + 1):
+            for i in range(len(tokens) - n + 1):
+                terms.append(" ".join(tokens[i:i + n]))
+
+        return terms
+
+    def _columns(self, terms):
+        """
+        (columns, known) for an array of terms; known marks the
+        terms that have a column.
+        """
+
+        positions = np.searchsorted(self.vocabulary, terms)
+
+        known = positions < self.n_features
+        known[known] = self.vocabulary[positions[known]] == terms[known]
+
+        return positions, known
+
+    def term_counts(self, texts):
+        """
+        Raw term counts, one row per text.
+        """
+
+        rows = []
+        terms = []
+
+        for i, text in enumerate(texts):
+
+            text_terms = self.analyze(text)
+
+            terms.extend(text_terms)
+            rows.extend([i] * len(text_terms))
+
+        if terms:
+            cols, known = self._columns(np.array(terms))
+
+            cols = cols[known]
+            rows = np.asarray(rows)[known]
+        else:
+            cols = rows = np.zeros(0, dtype=np.int64)
+
+        X = csr_matrix(
+            (np.ones(len(cols)), (rows, cols)),
+            shape=(len(texts), self.n_features)
+        )
+        X.sum_duplicates()
+
+        return X
+
+    def weight(self, X):
+        """
+        TF-IDF weighting and row normalization of term counts, in place.
+        """
+
+        if self.sublinear_tf:
+            np.log(X.data, X.data)
+            X.data += 1
+
+        X.data *= self.idf[X.indices]
+
+        # Columns with idf 0 (pruned buckets) drop out before the norm
+        X.eliminate_zeros()
+
+        if self.norm == "l2":
+
+            n_rows = X.shape[0]
+
+            row_of = np.repeat(np.arange(n_rows), np.diff(X.indptr))
+            norms = np.sqrt(np.bincount(row_of, weights=X.data ** 2, minlength=n_rows))
+            norms[norms == 0] = 1.0
+
+            X.data /= norms[row_of]
+
+        return X
+
+    def transform(self, texts):
+
+        return self.weight(self.term_counts(texts))
+
+
+class HashingTfidfVectorizer(ArrayTfidfVectorizer):
+    """
+    TF-IDF over hashed term buckets. The only fitted state is one
+    idf weight per bucket, so memory does not grow with the n-gram
+    space. Buckets seen in fewer than min_df training texts get
+    idf 0 and are dropped, like min_df on a vocabulary.
+    """
+
+    def __init__(self, n_features=DEFAULT_HASHING_FEATURES, stop_words=(),
+                 token_pattern=DEFAULT_TOKEN_PATTERN, ngram_range=(1, 1),
+                 lowercase=True, norm="l2", sublinear_tf=False, min_df=1,
+                 idf=None):
+
+        super().__init__(
+            None,
+            idf,
+            stop_words,
+            token_pattern,
+            ngram_range,
+            lowercase,
+            norm,
+            sublinear_tf
+        )
+
+        self._n_features = int(n_features)
+        self.min_df = min_df
+
+    @property
+    def n_features(self) -> int:
+
+        return self._n_features
+
+    def _columns(self, terms):
+
+        columns = np.fromiter(
+            (zlib.crc32(term.encode("utf-8")) for term in terms),
+            dtype=np.int64,
+            count=len(terms)
+        ) % self.n_features
+
+        return columns, np.ones(len(terms), dtype=bool)
+
+    def document_frequencies(self, X):
+        """
+        Per-bucket document frequencies of a term count matrix;
+        sums over chunks give the df of a whole stream.
+        """
+
+        return np.bincount(X.indices, minlength=self.n_features)
+
+    def fit_df(self, df, n_texts):
+        """
+        Sets idf from bucket document frequencies over n_texts, with
+        the same smoothing as sklearn: ln((1 + n) / (1 + df)) + 1.
+        """
+
+        idf = np.log((1 + n_texts) / (1 + df)) + 1
+        idf[df < self.min_df] = 0.0
+
+        self.idf = idf
+
+        return self
+
+    def fit_counts(self, X):
+
+        return self.fit_df(self.document_frequencies(X), X.shape[0])
+
+    def fit(self, texts):
+
+        return self.fit_counts(self.term_counts(texts))
+
+    def fit_transform(self, texts):
+
+        X = self.term_counts(texts)
+        self.fit_counts(X)
+
+        return self.weight(X)
@@ -0,0 +1,145 @@
+import numpy as np
+from scipy.sparse import csr_matrix, issparse
+from scipy.special import expit
+
+# -------------------------------------------------
+# FUSED LINEAR SCORER
+# -------------------------------------------------
+# The four LogisticRegression heads share one TF-IDF row, so their
+# coefficients are stacked into two weight blocks: the two binary
+# flag heads, and the two type heads side by side. A batch costs
+# one sparse x dense product for the flags, plus one for the type
+# heads restricted to the rows that were flagged.
+#
+# With a hashing featurizer most weight rows are buckets no training
+# text hit, whose coefficients stay exactly zero. Such blocks are
+# kept as CSR matrices instead of dense (n_features, k) arrays.
+
+# Weight blocks with fewer non-zeros than this fraction are stored sparse
+SPARSE_WEIGHT_DENSITY = 0.1
+
+
+def _weight_block(coefs):
+
+    weights = np.hstack([coef.T for coef in coefs])
+
+    if np.count_nonzero(weights) < SPARSE_WEIGHT_DENSITY * weights.size:
+        return csr_matrix(weights)
+
+    return np.ascontiguousarray(weights)
+
+
+def _type_columns(model):
+    """
+    (coef, intercept) with one row per class. A two-class head has a
+    single row w scoring classes_[1]; as [-w, w] the argmax over its
+    columns picks the same class as predict(), class 0 on a tie.
+    """
+
+    coef = model.coef_
+    intercept = model.intercept_
+
+    if len(model.classes_) == 2 and coef.shape[0] == 1:
+        coef = np.vstack([-coef, coef])
+        intercept = np.concatenate([-intercept, intercept])
+
+    return coef, intercept
+
+
+def _product(X, weights):
+
+    result = X @ weights
+
+    return result.toarray() if issparse(result) else result
+
+
+class FusedScorer:
+
+    def __init__(self, flag_weights, flag_bias, type_weights, type_bias,
+                 h_types, b_types):
+        """
+        flag_weights: (n_features, 2), hallucination then bias flag.
+        type_weights: (n_features, n_h_types + n_b_types).
+        Weights are dense arrays or CSR matrices. Arrays may be
+        memory-mapped; they are not copied.
+        """
+
+        self.flag_weights = flag_weights
+        self.flag_bias = flag_bias
+
+        self.type_weights = type_weights
+        self.type_bias = type_bias
+
+        self.h_types = np.asarray(h_types)
+        self.b_types = np.asarray(b_types)
+
+        self.n_h_types = len(self.h_types)
+
+    @classmethod
+    def from_models(cls, h_flag_model, h_type_model, b_flag_model, b_type_model):
+        """
+        Stacks the coefficients of four fitted LogisticRegression heads.
+        """
+
+        for model in (h_flag_model, b_flag_model):
+            if list(model.classes_) != [0, 1]:
+                raise ValueError("Flag heads must be binary with classes [0, 1]")
+
+        h_type_coef, h_type_intercept = _type_columns(h_type_model)
+        b_type_coef, b_type_intercept = _type_columns(b_type_model)
+
+        return cls(
+            _weight_block([h_flag_model.coef_, b_flag_model.coef_]),
+            np.concatenate([h_flag_model.intercept_, b_flag_model.intercept_]),
+            _weight_block([h_type_coef, b_type_coef]),
+            np.concatenate([h_type_intercept, b_type_intercept]),
+            h_type_model.classes_,
+            b_type_model.classes_
+        )
+
+    def score(self, X) -> list:
+        """
+        Same dicts as pipeline.score_texts. Type predictions are
+        only computed for rows whose flag is set; other rows get
+        "none".
+        """
+
+        flag_logits = _product(X, self.flag_weights) + self.flag_bias
+
+        # Positive-class probability, as predict_proba for binary LR
+        flag_probs = expit(flag_logits)
+
+        # predict() picks class 1 only when the logit is positive
+        h_preds = flag_logits[:, 0] > 0
+        b_preds = flag_logits[:, 1] > 0
+
+        h_type_preds = np.full(X.shape[0], "none", dtype=object)
+        b_type_preds = np.full(X.shape[0], "none", dtype=object)
+
+        rows = np.flatnonzero(h_preds | b_preds)
+
+        if rows.size:
+
+            type_logits = _product(X[rows], self.type_weights) + self.type_bias
+
+            h_rows = h_preds[rows]
+            b_rows = b_preds[rows]
+
+            h_type_preds[rows[h_rows]] = self.h_types[
+                type_logits[h_rows, :self.n_h_types].argmax(axis=1)
+            ]
+            b_type_preds[rows[b_rows]] = self.b_types[
+                type_logits[b_rows, self.n_h_types:].argmax(axis=1)
+            ]
+
+        return [
+            {
+                "h_pred": int(h_preds[i]),
+                "h_prob": float(flag_probs[i, 0]),
+                "h_type_pred": str(h_type_preds[i]),
+                "b_pred": int(b_preds[i]),
+                "b_prob": float(flag_probs[i, 1]),
+                "b_type_pred": str(b_type_preds[i])
+            }
+            for i in range(X.shape[0])
+        ]
@@ -0,0 +1,99 @@
+import os
+import threading
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+def _parse_band(value):
+
+    low, high = (float(part) for part in value.split(","))
+
+    return low, high
+
+
+# The LLM is only consulted when the hallucination flag probability
+# falls inside [low, high]; outside it the ML model is trusted.
+# "0,1" (the default) consults it for every eligible statement.
+# Tune with evaluate_llm_gate.py.
+LLM_UNCERTAINTY_BAND = _parse_band(os.environ.get("LLM_UNCERTAINTY_BAND", "0,1"))
+
+# LLM verdicts that mean the statement is a hallucination
+HALLUCINATION_VERDICTS = ["false", "misleading"]
+
+_lock = threading.Lock()
+_stats = {
+    "eligible": 0,
+    "invoked": 0,
+    "skipped_confident": 0,
+    "agreed": 0,
+    "disagreed": 0,
+    "no_verdict": 0
+}
+
+
+def set_uncertainty_band(low, high):
+
+    global LLM_UNCERTAINTY_BAND
+    LLM_UNCERTAINTY_BAND = (low, high)
+
+
+def in_uncertainty_band(h_prob) -> bool:
+
+    low, high = LLM_UNCERTAINTY_BAND
+
+    return low <= h_prob <= high
+
+
+def should_invoke_llm(h_prob) -> bool:
+    """
+    Records an eligible statement and decides whether its
+    hallucination score is uncertain enough to ask the LLM.
+    """
+
+    invoke = in_uncertainty_band(h_prob)
+
+    with _lock:
+        _stats["eligible"] += 1
+        _stats["invoked" if invoke else "skipped_confident"] += 1
+
+    return invoke
+
+
+def record_llm_agreement(h_pred, verdict):
+    """
+    Compares the LLM verdict with the ML hallucination flag.
+    """
+
+    if verdict in HALLUCINATION_VERDICTS:
+        key = "agreed" if h_pred else "disagreed"
+    elif verdict == "true":
+        key = "disagreed" if h_pred else "agreed"
+    else:
+        key = "no_verdict"
+
+    with _lock:
+        _stats[key] += 1
+
+
+def llm_gate_stats():
+    """
+    Counters plus skip rate (share of eligible statements answered
+    without the LLM) and agreement rate (among LLM verdicts).
+    """
+
+    with _lock:
+        stats = dict(_stats)
+
+    judged = stats["agreed"] + stats["disagreed"]
+
+    stats["band"] = LLM_UNCERTAINTY_BAND
+    stats["skip_rate"] = (
+        stats["skipped_confident"] / stats["eligible"]
+        if stats["eligible"] else 0.0
+    )
+    stats["agreement_rate"] = (
+        stats["agreed"] / judged
+        if judged else 0.0
+    )
+
+    return stats
@@ -0,0 +1,271 @@
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+
+from ollama_reasoner import ollama_judge, fallback_judgment
+
+try:
+    import fcntl
+except ImportError:  # Windows: limit is per process only
+    fcntl = None
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+# Generations allowed at once on this host (all processes together).
+LLM_CONCURRENCY = int(os.environ.get("LLM_CONCURRENCY", "1"))
+
+# Distinct statements allowed to wait for a slot in this process;
+# beyond that new work is rejected immediately.
+LLM_QUEUE_SIZE = int(os.environ.get("LLM_QUEUE_SIZE", "16"))
+
+# Seconds a statement may wait for a slot before giving up.
+LLM_DEADLINE = float(os.environ.get("LLM_DEADLINE", "20"))
+
+# Lock files that implement the cross-process slots.
+LLM_LOCK_DIR = os.environ.get(
+    "LLM_LOCK_DIR",
+    os.path.join(tempfile.gettempdir(), "dsc-llm-slots")
+)
+
+# Poll interval while waiting for a cross-process slot.
+SLOT_POLL_INTERVAL = 0.05
+
+
+class _Slots:
+    """
+    Global concurrency limit: a thread semaphore for this process,
+    plus one flock()ed lock file per slot shared with other processes.
+    """
+
+    def __init__(self, size, lock_dir):
+
+        self.size = size
+        self.threads = threading.BoundedSemaphore(size)
+        self.lock_dir = lock_dir
+
+        if fcntl is not None:
+            os.makedirs(lock_dir, exist_ok=True)
+
+    def acquire(self, deadline, cancelled=None):
+        """
+        Returns a release handle, or None if deadline passed (or
+        the optional cancelled() check turned true) first.
+        """
+
+        while True:
+
+            remaining = max(0.0, deadline - time.monotonic())
+
+            if cancelled is None:
+                acquired = self.threads.acquire(timeout=remaining)
+                break
+
+            acquired = self.threads.acquire(timeout=min(remaining, SLOT_POLL_INTERVAL))
+
+            if acquired or remaining <= SLOT_POLL_INTERVAL or cancelled():
+                break
+
+        if not acquired:
+            return None
+
+        if fcntl is None:
+            return -1
+
+        while True:
+
+            for slot in range(self.size):
+
+                path = os.path.join(self.lock_dir, f"slot-{slot}.lock")
+                fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o666)
+
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    return fd
+                except OSError:
+                    os.close(fd)
+
+            if time.monotonic() >= deadline or (cancelled is not None and cancelled()):
+                self.threads.release()
+                return None
+
+            time.sleep(SLOT_POLL_INTERVAL)
+
+    def release(self, handle):
+
+        if handle != -1:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+            os.close(handle)
+
+        self.threads.release()
+
+
+class _InFlight:
+    """
+    One generation shared by every caller asking for the same
+    statement. Its cancel token only fires while the owner is the
+    sole caller: anyone joining later pins the generation. cancelled
+    marks a result cut short by the token, which joiners never use.
+    """
+
+    def __init__(self, cancel):
+
+        self.future = Future()
+        self.cancel = cancel
+        self.pinned = cancel is None
+        self.cancelled = False
+
+    def is_set(self):
+
+        return not self.pinned and self.cancel.is_set()
+
+
+_slots = _Slots(LLM_CONCURRENCY, LLM_LOCK_DIR)
+
+_lock = threading.Lock()
+_inflight = {}
+_waiting = 0
+
+_stats = {
+    "submitted": 0,
+    "deduplicated": 0,
+    "rejected": 0,
+    "timed_out": 0,
+    "cancelled": 0,
+    "completed": 0
+}
+
+
+def scheduler_stats():
+
+    with _lock:
+        stats = dict(_stats)
+        stats["waiting"] = _waiting
+        stats["in_flight"] = len(_inflight)
+
+    return stats
+
+
+def _unavailable(statement, reason):
+
+    judgment = fallback_judgment(statement)
+    judgment["reasoning"] = reason
+
+    return judgment
+
+
+def schedule_judgment(statement: str, deadline=None, cancel=None) -> dict:
+    """
+    ollama_judge behind the scheduler.
+
+    Identical statements in flight share one generation. Work that
+    cannot get a slot before its deadline, or arrives while the
+    queue is full, gets the usual "unverifiable" judgment instead.
+
+    cancel is an optional threading.Event for speculative calls;
+    once set, the call stops waiting or generating and returns the
+    "unverifiable" judgment.
+    """
+
+    global _waiting
+
+    if deadline is None:
+        deadline = time.monotonic() + LLM_DEADLINE
+
+    with _lock:
+
+        _stats["submitted"] += 1
+        entry = _inflight.get(statement)
+
+        if entry is not None and (entry.cancelled or entry.is_set()):
+            # Cancelled speculative generation: start a fresh one
+            entry = None
+
+        if entry is not None:
+            _stats["deduplicated"] += 1
+            entry.pinned = True
+            owner = False
+
+        elif _waiting >= LLM_QUEUE_SIZE:
+            _stats["rejected"] += 1
+            return _unavailable(statement, "Local LLM queue is saturated.")
+
+        else:
+            entry = _InFlight(cancel)
+            _inflight[statement] = entry
+            _waiting += 1
+            owner = True
+
+    future = entry.future
+
+    if not owner:
+        # The owner always completes the future, within its own
+        # deadline plus one generation.
+        judgment = future.result()
+
+        if entry.cancelled:
+            # Joined just as the owner gave up: not our answer
+            return schedule_judgment(statement, deadline, cancel)
+
+        return judgment
+
+    try:
+
+        try:
+            handle = _slots.acquire(
+                deadline,
+                entry.is_set if cancel is not None else None
+            )
+        finally:
+            with _lock:
+                _waiting -= 1
+
+        # The raw token, not entry.is_set(): a caller may have pinned
+        # the entry after the owner saw the cancellation
+        if handle is None and cancel is not None and cancel.is_set():
+
+            with _lock:
+                entry.cancelled = True
+                _stats["cancelled"] += 1
+
+            judgment = _unavailable(statement, "Speculative LLM call cancelled.")
+
+        elif handle is None:
+
+            with _lock:
+                _stats["timed_out"] += 1
+
+            judgment = _unavailable(statement, "Local LLM is busy; deadline exceeded.")
+
+        else:
+
+            try:
+                judgment = ollama_judge(
+                    statement,
+                    entry if cancel is not None else None
+                )
+            finally:
+                _slots.release(handle)
+
+            with _lock:
+                entry.cancelled = (
+                    cancel is not None
+                    and cancel.is_set()
+                    and bool(judgment.get("fallback"))
+                )
+                _stats["cancelled" if entry.cancelled else "completed"] += 1
+
+        future.set_result(judgment)
+
+        return judgment
+
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+
+    finally:
+        with _lock:
+            if _inflight.get(statement) is entry:
+                del _inflight[statement]
@@ -0,0 +1,382 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+from scipy.sparse import csr_matrix, issparse
+
+from featurizers import ArrayTfidfVectorizer, HashingTfidfVectorizer
+from fused_scorer import FusedScorer
+
+# -------------------------------------------------
+# PICKLE-FREE MODEL EXPORT
+# -------------------------------------------------
+# A trained model set is written as flat .npy arrays plus a
+# manifest.json into its own version directory:
+#
+#   model_export/
+#       CURRENT                 name of the version to serve
+#       20260101-120000/
+#           manifest.json
+#           vocabulary.npy      sorted terms (column = position),
+#                               tfidf featurizer only
+#           idf.npy
+#           stop_words.npy
+#           flag_weights.npy    FusedScorer weight blocks
+#           ...
+#
+# Sparse weight blocks (hashing featurizer) are stored as their CSR
+# arrays: flag_weights.data.npy, .indices.npy and .indptr.npy.
+#
+# Arrays are loaded with np.load(mmap_mode="r"), so forked workers
+# share the pages and nothing needs sklearn or unpickling. A new
+# export never touches files of the version it replaces, which
+# workers may still have mapped; older versions are removed.
+#
+# Exports are build output and are not committed: deploys run
+# "python model_export.py" to build one from the committed pickles.
+# The manifest records the sha256 of the pickles it was built from,
+# so a stale export is detected once the pickles change.
+
+EXPORT_FORMAT_VERSION = 2
+
+# Version 1 is version 2 without hashing featurizers or sparse weights
+SUPPORTED_FORMAT_VERSIONS = (1, 2)
+
+CURRENT_FILE = "CURRENT"
+MANIFEST_FILE = "manifest.json"
+
+# Versions kept under the export root: CURRENT and the one before it.
+KEEP_VERSIONS = 2
+
+# Pickles train_models.py writes, in export_models argument order.
+MODEL_PICKLES = [
+    "tfidf_vectorizer",
+    "hallucination_flag_model",
+    "hallucination_type_model",
+    "bias_flag_model",
+    "bias_type_model"
+]
+
+SCORER_ARRAYS = [
+    "flag_weights",
+    "flag_bias",
+    "type_weights",
+    "type_bias",
+    "h_types",
+    "b_types"
+]
+
+
+def _featurizer_manifest(vectorizer):
+    """
+    Checks that vectorizer can be reproduced by ArrayTfidfVectorizer
+    or HashingTfidfVectorizer and returns (settings, arrays).
+    """
+
+    if isinstance(vectorizer, HashingTfidfVectorizer):
+
+        if vectorizer.idf is None:
+            raise ValueError("Cannot export an unfitted hashing featurizer")
+
+        settings = {
+            "type": "hashing",
+            "n_features": vectorizer.n_features,
+            "token_pattern": vectorizer.token_pattern.pattern,
+            "ngram_range": list(vectorizer.ngram_range),
+            "lowercase": vectorizer.lowercase,
+            "norm": vectorizer.norm,
+            "sublinear_tf": vectorizer.sublinear_tf
+        }
+
+        arrays = {
+            "idf": np.asarray(vectorizer.idf, dtype=np.float64),
+            "stop_words": np.array(sorted(vectorizer.stop_words))
+        }
+
+        return settings, arrays
+
+    params = vectorizer.get_params()
+
+    unsupported = {
+        "analyzer": "word",
+        "tokenizer": None,
+        "preprocessor": None,
+        "strip_accents": None,
+        "binary": False,
+        "use_idf": True
+    }
+
+    for name, expected in unsupported.items():
+        if params[name] != expected:
+            raise ValueError(f"Cannot export vectorizer with {name}={params[name]!r}")
+
+    if params["norm"] not in ("l2", None):
+        raise ValueError(f"Cannot export vectorizer with norm={params['norm']!r}")
+
+    terms = sorted(vectorizer.vocabulary_)
+
+    if any(vectorizer.vocabulary_[term] != i for i, term in enumerate(terms)):
+        raise ValueError("Vectorizer columns are not in sorted vocabulary order")
+
+    settings = {
+        "type": "tfidf",
+        "token_pattern": params["token_pattern"],
+        "ngram_range": list(params["ngram_range"]),
+        "lowercase": params["lowercase"],
+        "norm": params["norm"],
+        "sublinear_tf": params["sublinear_tf"]
+    }
+
+    arrays = {
+        "vocabulary": np.array(terms),
+        "idf": np.asarray(vectorizer.idf_, dtype=np.float64),
+        "stop_words": np.array(sorted(vectorizer.get_stop_words() or []))
+    }
+
+    return settings, arrays
+
+
+def pickle_hashes(directory) -> dict:
+    """
+    {file name: sha256} of the MODEL_PICKLES files in directory.
+    """
+
+    hashes = {}
+
+    for name in MODEL_PICKLES:
+
+        path = os.path.join(directory, f"{name}.pkl")
+
+        if not os.path.exists(path):
+            continue
+
+        with open(path, "rb") as f:
+            hashes[f"{name}.pkl"] = hashlib.sha256(f.read()).hexdigest()
+
+    return hashes
+
+
+def _new_version_dir(root):
+    """
+    Creates and returns (version, path) of a fresh version directory.
+    Exports within the same second get a -1, -2, ... suffix.
+    """
+
+    version = time.strftime("%Y%m%d-%H%M%S")
+    suffix = 0
+
+    while True:
+
+        name = f"{version}-{suffix}" if suffix else version
+        directory = os.path.join(root, name)
+
+        try:
+            os.makedirs(directory)
+            return name, directory
+        except FileExistsError:
+            suffix += 1
+
+
+def export_models(root, vectorizer, h_flag_model, h_type_model,
+                  b_flag_model, b_type_model, pickle_dir=None):
+    """
+    Writes a new version directory under root and makes it CURRENT.
+    pickle_dir is where the same models were saved as pickles; their
+    hashes go into the manifest. Returns the version directory path.
+    """
+
+    featurizer, arrays = _featurizer_manifest(vectorizer)
+
+    scorer = FusedScorer.from_models(
+        h_flag_model,
+        h_type_model,
+        b_flag_model,
+        b_type_model
+    )
+
+    arrays.update({
+        "flag_bias": scorer.flag_bias,
+        "type_bias": scorer.type_bias,
+        "h_types": np.array([str(c) for c in scorer.h_types]),
+        "b_types": np.array([str(c) for c in scorer.b_types])
+    })
+
+    sparse_arrays = {}
+
+    for name in ["flag_weights", "type_weights"]:
+
+        weights = getattr(scorer, name)
+
+        if issparse(weights):
+
+            sparse_arrays[name] = {"shape": list(weights.shape)}
+
+            for part in ["data", "indices", "indptr"]:
+                arrays[f"{name}.{part}"] = getattr(weights, part)
+                sparse_arrays[name][part] = f"{name}.{part}"
+
+        else:
+            arrays[name] = weights
+
+    os.makedirs(root, exist_ok=True)
+
+    version, directory = _new_version_dir(root)
+
+    for name, array in arrays.items():
+        np.save(os.path.join(directory, f"{name}.npy"), np.ascontiguousarray(array))
+
+    manifest = {
+        "format_version": EXPORT_FORMAT_VERSION,
+        "version": version,
+        "n_features": scorer.flag_weights.shape[0],
+        "featurizer": featurizer,
+        "arrays": {name: f"{name}.npy" for name in arrays},
+        "sparse_arrays": sparse_arrays,
+        "sources": pickle_hashes(pickle_dir) if pickle_dir else {}
+    }
+
+    with open(os.path.join(directory, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    # Switch CURRENT atomically
+    pointer = os.path.join(root, CURRENT_FILE)
+
+    with open(pointer + ".tmp", "w", encoding="utf-8") as f:
+        f.write(version + "\n")
+
+    os.replace(pointer + ".tmp", pointer)
+
+    prune_versions(root)
+
+    return directory
+
+
+def prune_versions(root, keep=KEEP_VERSIONS):
+    """
+    Deletes all but the newest keep version directories under root,
+    never the one CURRENT names.
+    """
+
+    current = _current_version(root)
+
+    versions = sorted(
+        name
+        for name in os.listdir(root)
+        if os.path.isfile(os.path.join(root, name, MANIFEST_FILE))
+    )
+
+    for name in versions[:-keep]:
+        if name != current:
+            shutil.rmtree(os.path.join(root, name))
+
+
+def has_exported_models(root) -> bool:
+
+    return os.path.exists(os.path.join(root, CURRENT_FILE))
+
+
+def _current_version(root):
+
+    try:
+        with open(os.path.join(root, CURRENT_FILE), "r", encoding="utf-8") as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+def _current_manifest(root):
+
+    directory = os.path.join(root, _current_version(root))
+
+    with open(os.path.join(directory, MANIFEST_FILE), "r", encoding="utf-8") as f:
+        return directory, json.load(f)
+
+
+def export_matches_pickles(root, pickle_dir) -> bool:
+    """
+    True when root has a CURRENT export built from exactly the
+    pickles now in pickle_dir. Exports that recorded no pickle
+    hashes never match.
+    """
+
+    if not has_exported_models(root):
+        return False
+
+    _, manifest = _current_manifest(root)
+
+    sources = manifest.get("sources")
+
+    return bool(sources) and sources == pickle_hashes(pickle_dir)
+
+
+def load_exported_models(root):
+    """
+    (featurizer, FusedScorer) for the CURRENT version under root,
+    with every array memory-mapped.
+    """
+
+    directory, manifest = _current_manifest(root)
+
+    if manifest["format_version"] not in SUPPORTED_FORMAT_VERSIONS:
+        raise ValueError(
+            f"Unsupported model export format {manifest['format_version']}"
+        )
+
+    arrays = {
+        name: np.load(os.path.join(directory, filename), mmap_mode="r")
+        for name, filename in manifest["arrays"].items()
+    }
+
+    for name, parts in manifest.get("sparse_arrays", {}).items():
+        arrays[name] = csr_matrix(
+            tuple(arrays.pop(parts[part]) for part in ["data", "indices", "indptr"]),
+            shape=tuple(parts["shape"]),
+            copy=False
+        )
+
+    settings = dict(manifest["featurizer"])
+    featurizer_type = settings.pop("type")
+
+    if featurizer_type == "tfidf":
+        featurizer = ArrayTfidfVectorizer(
+            arrays["vocabulary"],
+            arrays["idf"],
+            arrays["stop_words"],
+            **settings
+        )
+
+    elif featurizer_type == "hashing":
+        featurizer = HashingTfidfVectorizer(
+            stop_words=arrays["stop_words"],
+            idf=arrays["idf"],
+            **settings
+        )
+
+    else:
+        raise ValueError(f"Unsupported featurizer {featurizer_type!r} in model export")
+
+    scorer = FusedScorer(*(arrays[name] for name in SCORER_ARRAYS))
+
+    return featurizer, scorer
+
+
+if __name__ == "__main__":
+
+    # Converts the committed pickles into an export
+    import joblib
+
+    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+    models = [
+        joblib.load(os.path.join(BASE_DIR, f"{name}.pkl"))
+        for name in MODEL_PICKLES
+    ]
+
+    print("Exported to", export_models(
+        os.path.join(BASE_DIR, "model_export"),
+        *models,
+        pickle_dir=BASE_DIR
+    ))
@@ -1,3 +1,5 @@
+from phrase_scanner import register_lexicon, scan
+
 NEGATION_WORDS = [
     "not",
     "never",
@@ -10,14 +12,12 @@ NEGATION_WORDS = [
     "can't"
 ]
 
+NEGATION_LEXICON = register_lexicon("negation", NEGATION_WORDS)
 
-def contains_negation(text):
-
-    text = text.lower()
 
-    for word in NEGATION_WORDS:
+def contains_negation(text, hits=None):
 
-        if word in text:
-            return True
+    if hits is None:
+        hits = scan(text)
 
-    return False
\ No newline at end of file
+    return hits.has(NEGATION_LEXICON)
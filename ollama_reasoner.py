@@ -1,14 +1,56 @@
-import subprocess
+import codecs
 import json
+import os
+import shutil
+import subprocess
+import threading
 
+import requests
+from requests.adapters import HTTPAdapter
 
-def ollama_judge(statement: str) -> dict:
-    """
-    Uses local Ollama LLM for commonsense reasoning.
-    Returns a structured judgment compatible with pipeline.py
-    """
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+OLLAMA_URL = os.environ.get("OLLAMA_URL", "http://localhost:11434").rstrip("/")
+OLLAMA_MODEL = os.environ.get("OLLAMA_MODEL", "llama3")
+
+# "ollama" for the native /api/generate endpoint, "openai" for any
+# OpenAI-compatible local server (/v1/chat/completions).
+OLLAMA_API = os.environ.get("OLLAMA_API", "ollama")
+
+# How long the daemon keeps the model loaded after a request.
+OLLAMA_KEEP_ALIVE = os.environ.get("OLLAMA_KEEP_ALIVE", "30m")
+
+OLLAMA_TIMEOUT = 30
+
+# Fields a judgment must carry; generation stops once all are read.
+REQUIRED_FIELDS = ("verdict", "reasoning", "corrected_statement", "bias", "bias_type")
 
-    prompt = f"""
+# Verdicts build_prompt asks for. Any other verdict makes the output
+# malformed; the other fields are normalized whatever their type.
+VERDICTS = ("true", "false", "misleading", "unverifiable")
+
+# Output that has not opened the JSON object within this many
+# characters, or whose object grows past the second limit, is
+# treated as malformed instead of waiting for the timeout.
+MAX_PREAMBLE_CHARS = 2000
+MAX_JUDGMENT_CHARS = 8000
+
+# Bump whenever build_prompt changes, so cached verdicts from the
+# old prompt are no longer served.
+PROMPT_VERSION = 1
+
+# Fall back to `ollama run` when the HTTP daemon is not reachable.
+OLLAMA_CLI = shutil.which("ollama")
+
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=8))
+_session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=8))
+
+
+def build_prompt(statement: str) -> str:
+
+    return f"""
 You are an expert fact checker and bias analyst.
 
 Judge the following statement using common sense and general world knowledge.
@@ -38,50 +80,358 @@ Statement:
 "{statement}"
 """
 
-    try:
-        result = subprocess.run(
-            ["ollama", "run", "llama3"],
-            input=prompt,
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            timeout=30
-        )
-
-        raw_output = result.stdout.strip()
-
-        # Safely extract JSON block
-        start = raw_output.find("{")
-        end = raw_output.rfind("}") + 1
-
-        if start == -1 or end == -1:
-            raise ValueError("No JSON found in Ollama output")
-
-        json_text = raw_output[start:end]
-        data = json.loads(json_text)
-
-        # ---- HARD SAFETY NORMALIZATION ----
-        verdict = data.get("verdict", "unverifiable")
-        bias = data.get("bias", "no")
-        bias_type = data.get("bias_type", "none")
-
-        if bias != "yes":
-            bias_type = "none"
-
-        return {
-            "verdict": verdict,
-            "reasoning": data.get("reasoning", ""),
-            "corrected_statement": data.get("corrected_statement", statement),
-            "bias": bias,
-            "bias_type": bias_type
+
+def fallback_judgment(statement: str) -> dict:
+    """
+    Judgment used when no LLM answer is available. The "fallback"
+    flag keeps it out of caches.
+    """
+
+    return {
+        "verdict": "unverifiable",
+        "reasoning": "Local LLM unavailable or response malformed.",
+        "corrected_statement": statement,
+        "bias": "no",
+        "bias_type": "none",
+        "fallback": True
+    }
+
+
+# -------------------------------------------------
+# STREAMING PARSER
+# -------------------------------------------------
+class JudgmentStreamParser:
+    """
+    Incremental parser for the judgment object in streamed output.
+
+    feed() returns the decoded object as soon as it closes, or as
+    soon as every REQUIRED_FIELDS member has been read; None while
+    more text is needed. Raises ValueError as soon as the output
+    can no longer be a valid judgment.
+    """
+
+    def __init__(self):
+
+        self.text = ""
+        self.pos = 0
+        self.start = -1
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, piece: str):
+
+        self.text += piece
+        text = self.text
+
+        while self.pos < len(text):
+
+            ch = text[self.pos]
+            self.pos += 1
+
+            if self.start == -1:
+
+                if ch == "{":
+                    self.start = self.pos - 1
+                    self.depth = 1
+
+                elif self.pos > MAX_PREAMBLE_CHARS:
+                    raise ValueError("No JSON found in Ollama output")
+
+                continue
+
+            if self.in_string:
+
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+
+                continue
+
+            if ch == '"':
+                self.in_string = True
+
+            elif ch in "{[":
+                self.depth += 1
+
+            elif ch in "}]":
+                self.depth -= 1
+
+                if self.depth == 0:
+                    return _decode_judgment(text[self.start:self.pos])
+
+            elif ch == "," and self.depth == 1:
+                # A member just ended: the prefix must be valid JSON
+                data = _decode_judgment(
+                    text[self.start:self.pos - 1] + "}",
+                    complete=False
+                )
+
+                if all(field in data for field in REQUIRED_FIELDS):
+                    return data
+
+        if self.start != -1 and len(text) - self.start > MAX_JUDGMENT_CHARS:
+            raise ValueError("Ollama output too long for a judgment")
+
+        return None
+
+
+def _verdict(value):
+    """
+    The VERDICTS member value names, or None.
+    """
+
+    if isinstance(value, str) and value.strip().lower() in VERDICTS:
+        return value.strip().lower()
+
+    return None
+
+
+def _text(value, default):
+    """
+    value when it is a non-empty string, else default (null, numbers,
+    lists: all common in small-model output).
+    """
+
+    if isinstance(value, str) and value.strip():
+        return value.strip()
+
+    return default
+
+
+def _decode_judgment(json_text: str, complete=True) -> dict:
+    """
+    Decodes a judgment object, or the prefix of one when complete is
+    False. Raises ValueError when it is not an object or its verdict
+    is invalid (or, once complete, missing).
+    """
+
+    data = json.loads(json_text)
+
+    if not isinstance(data, dict):
+        raise ValueError("Ollama output is not a JSON object")
+
+    if (complete or "verdict" in data) and _verdict(data.get("verdict")) is None:
+        raise ValueError("Invalid verdict in Ollama output")
+
+    return data
+
+
+def normalize_judgment(data: dict, statement: str) -> dict:
+
+    # ---- HARD SAFETY NORMALIZATION ----
+    verdict = _verdict(data.get("verdict")) or "unverifiable"
+    bias = _text(data.get("bias"), "no").lower()
+    bias_type = _text(data.get("bias_type"), "none")
+
+    if bias != "yes":
+        bias_type = "none"
+
+    return {
+        "verdict": verdict,
+        "reasoning": _text(data.get("reasoning"), ""),
+        "corrected_statement": _text(data.get("corrected_statement", statement), ""),
+        "bias": bias,
+        "bias_type": bias_type
+    }
+
+
+def parse_judgment(raw_output: str, statement: str) -> dict:
+    """
+    Extracts and normalizes the JSON judgment from raw LLM output.
+    Raises ValueError if there is none.
+    """
+
+    data = JudgmentStreamParser().feed(raw_output)
+
+    if data is None:
+        raise ValueError("No JSON found in Ollama output")
+
+    return normalize_judgment(data, statement)
+
+
+# -------------------------------------------------
+# BACKENDS
+# -------------------------------------------------
+def _stream_chunks(response):
+    """
+    Yields generated text pieces from a streaming response.
+    """
+
+    for line in response.iter_lines(decode_unicode=True):
+
+        if not line:
+            continue
+
+        if OLLAMA_API == "openai":
+
+            if not line.startswith("data:"):
+                continue
+
+            line = line[len("data:"):].strip()
+
+            if line == "[DONE]":
+                return
+
+            choices = json.loads(line).get("choices") or [{}]
+
+            yield choices[0].get("delta", {}).get("content") or ""
+
+        else:
+
+            data = json.loads(line)
+
+            yield data.get("response", "")
+
+            if data.get("done"):
+                return
+
+
+class GenerationCancelled(Exception):
+    pass
+
+
+def _http_pieces(prompt: str):
+    """
+    Streams one generation from the local HTTP server over the
+    pooled connection, with JSON output and the model kept loaded.
+    Closing the generator closes the stream, which makes the
+    server stop generating.
+    """
+
+    if OLLAMA_API == "openai":
+
+        url = f"{OLLAMA_URL}/v1/chat/completions"
+        payload = {
+            "model": OLLAMA_MODEL,
+            "messages": [{"role": "user", "content": prompt}],
+            "response_format": {"type": "json_object"},
+            "stream": True
+        }
+
+    else:
+
+        url = f"{OLLAMA_URL}/api/generate"
+        payload = {
+            "model": OLLAMA_MODEL,
+            "prompt": prompt,
+            "format": "json",
+            "stream": True,
+            "keep_alive": OLLAMA_KEEP_ALIVE
         }
 
+    with _session.post(
+        url,
+        json=payload,
+        stream=True,
+        timeout=(3.05, OLLAMA_TIMEOUT)
+    ) as response:
+
+        response.raise_for_status()
+
+        yield from _stream_chunks(response)
+
+
+def _cli_pieces(prompt: str):
+    """
+    Streams `ollama run` stdout. The process is killed when the
+    generator is closed or after OLLAMA_TIMEOUT seconds.
+    """
+
+    process = subprocess.Popen(
+        [OLLAMA_CLI, "run", OLLAMA_MODEL],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL
+    )
+
+    timer = threading.Timer(OLLAMA_TIMEOUT, process.kill)
+    timer.start()
+
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    try:
+        process.stdin.write(prompt.encode("utf-8"))
+        process.stdin.close()
+
+        while True:
+
+            chunk = os.read(process.stdout.fileno(), 4096)
+
+            if not chunk:
+                break
+
+            yield decoder.decode(chunk)
+
+        yield decoder.decode(b"", final=True)
+
+    finally:
+        timer.cancel()
+
+        if process.poll() is None:
+            process.kill()
+
+        process.wait()
+        process.stdout.close()
+
+
+def _read_judgment(pieces, statement: str, cancel=None) -> dict:
+    """
+    Feeds streamed pieces to the parser and stops the generation
+    as soon as the judgment is complete, malformed or cancelled.
+    """
+
+    parser = JudgmentStreamParser()
+
+    try:
+
+        for piece in pieces:
+
+            if cancel is not None and cancel.is_set():
+                raise GenerationCancelled()
+
+            data = parser.feed(piece)
+
+            if data is not None:
+                return normalize_judgment(data, statement)
+
+    finally:
+        pieces.close()
+
+    raise ValueError("Ollama output ended before the judgment was complete")
+
+
+def generate_judgment(prompt: str, statement: str, cancel=None) -> dict:
+    """
+    Judgment for prompt: HTTP daemon first, then the CLI if the
+    daemon is absent and the binary is installed.
+
+    cancel is an optional Event-like token checked between chunks.
+    """
+
+    try:
+        return _read_judgment(_http_pieces(prompt), statement, cancel)
+
+    except requests.ConnectionError:
+
+        if not OLLAMA_CLI:
+            raise
+
+        return _read_judgment(_cli_pieces(prompt), statement, cancel)
+
+
+def ollama_judge(statement: str, cancel=None) -> dict:
+    """
+    Uses local Ollama LLM for commonsense reasoning.
+    Returns a structured judgment compatible with pipeline.py
+    """
+
+    try:
+        return generate_judgment(build_prompt(statement), statement, cancel)
+
     except Exception:
         # Absolute safety fallback (pipeline-safe)
-        return {
-            "verdict": "unverifiable",
-            "reasoning": "Local LLM unavailable or response malformed.",
-            "corrected_statement": statement,
-            "bias": "no",
-            "bias_type": "none"
-        }
+        return fallback_judgment(statement)
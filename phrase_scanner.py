@@ -0,0 +1,224 @@
+import threading
+
+# -------------------------------------------------
+# SHARED PHRASE SCANNER
+# -------------------------------------------------
+# The rule-based stages register their phrase lists here. All of
+# them are compiled into one Aho-Corasick automaton, so a text is
+# scanned once, in time independent of lexicon size, and every
+# stage reads its matches from the resulting PhraseHits.
+#
+# Phrases only match on word boundaries: "no" does not match
+# inside "know", "all" does not match inside "small".
+
+_lock = threading.Lock()
+
+# lexicon name -> [(phrase, label)] in declaration order
+_lexicons = {}
+
+_automaton = None
+
+
+def _is_word_char(ch):
+
+    return ch.isalnum() or ch == "_"
+
+
+def register_lexicon(name, phrases):
+    """
+    Adds (or replaces) a lexicon and returns its name.
+
+    phrases is a list of phrases, or a dict mapping a label to a
+    list of phrases. Declaration order is kept as match priority.
+    """
+
+    if isinstance(phrases, dict):
+        entries = [
+            (phrase.lower(), label)
+            for label, label_phrases in phrases.items()
+            for phrase in label_phrases
+        ]
+    else:
+        entries = [(phrase.lower(), phrase.lower()) for phrase in phrases]
+
+    global _automaton
+
+    with _lock:
+        _lexicons[name] = entries
+        _automaton = None
+
+    return name
+
+
+class _Automaton:
+    """
+    Aho-Corasick trie over every registered phrase. Each state's
+    output already includes the outputs of its failure chain.
+    """
+
+    def __init__(self, lexicons):
+
+        # Per phrase: (lexicon, phrase, label, priority)
+        self.phrases = []
+
+        self.goto = [{}]
+        self.output = [[]]
+
+        for lexicon, entries in lexicons.items():
+            for priority, (phrase, label) in enumerate(entries):
+
+                self.phrases.append((lexicon, phrase, label, priority))
+                self._insert(phrase, len(self.phrases) - 1)
+
+        self.fail = [0] * len(self.goto)
+
+        queue = list(self.goto[0].values())
+
+        for state in queue:
+
+            for ch, child in self.goto[state].items():
+
+                queue.append(child)
+
+                fallback = self.fail[state]
+
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+
+                target = self.goto[fallback].get(ch, 0)
+                self.fail[child] = target if target != child else 0
+
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def _insert(self, phrase, phrase_id):
+
+        state = 0
+
+        for ch in phrase:
+
+            child = self.goto[state].get(ch)
+
+            if child is None:
+                child = len(self.goto)
+                self.goto[state][ch] = child
+                self.goto.append({})
+                self.output.append([])
+
+            state = child
+
+        self.output[state].append(phrase_id)
+
+    def scan(self, text):
+        """
+        Yields (start, end, phrase_id) for every word-bounded match.
+        """
+
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+        phrases = self.phrases
+
+        state = 0
+
+        for i, ch in enumerate(text):
+
+            while state and ch not in goto[state]:
+                state = fail[state]
+
+            state = goto[state].get(ch, 0)
+
+            if not output[state]:
+                continue
+
+            after_ok = i + 1 == len(text) or not _is_word_char(text[i + 1])
+
+            for phrase_id in output[state]:
+
+                phrase = phrases[phrase_id][1]
+                start = i + 1 - len(phrase)
+
+                if _is_word_char(phrase[-1]) and not after_ok:
+                    continue
+
+                if (
+                    start > 0
+                    and _is_word_char(phrase[0])
+                    and _is_word_char(text[start - 1])
+                ):
+                    continue
+
+                yield start, i + 1, phrase_id
+
+
+def _get_automaton():
+
+    global _automaton
+
+    with _lock:
+
+        if _automaton is None:
+            _automaton = _Automaton(_lexicons)
+
+        return _automaton
+
+
+class PhraseHits:
+    """
+    Matches of every registered lexicon in one lowercased text.
+    """
+
+    def __init__(self, text, matches):
+
+        self.text = text
+        self.by_lexicon = {}
+
+        for start, end, lexicon, phrase, label, priority in matches:
+            self.by_lexicon.setdefault(lexicon, []).append(
+                (start, end, phrase, label, priority)
+            )
+
+    def has(self, lexicon) -> bool:
+
+        return lexicon in self.by_lexicon
+
+    def phrases(self, lexicon) -> list:
+
+        return [hit[2] for hit in self.by_lexicon.get(lexicon, [])]
+
+    def first(self, lexicon):
+        """
+        Label of the earliest-declared phrase that matched, the
+        same answer as checking the lexicon in order.
+        """
+
+        hits = self.by_lexicon.get(lexicon)
+
+        if not hits:
+            return None
+
+        return min(hits, key=lambda hit: hit[4])[3]
+
+    def at_start(self, lexicon) -> bool:
+        """
+        True if a phrase matched at the first non-space character.
+        """
+
+        offset = len(self.text) - len(self.text.lstrip())
+
+        return any(hit[0] == offset for hit in self.by_lexicon.get(lexicon, []))
+
+
+def scan(text: str) -> PhraseHits:
+    """
+    Scans text once against every registered lexicon.
+    """
+
+    text = text.lower()
+    automaton = _get_automaton()
+
+    matches = [
+        (start, end) + automaton.phrases[phrase_id]
+        for start, end, phrase_id in automaton.scan(text)
+    ]
+
+    return PhraseHits(text, matches)
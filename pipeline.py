@@ -1,90 +1,515 @@
+import asyncio
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import joblib
 
 from claim_normalizer import normalize_claim
 from verifier_semantic import verify_structured_claim
+from verifier_semantic import prefetch_structured_claims
 from evidence_wikipedia import query_wikipedia_summary
-from statement_classifier import classify_statement
+from evidence_wikipedia import query_wikipedia_summaries
+from evidence_cache import request_scope
+from evidence_http import transient_failure_count
 from contradiction_checker import check_contradiction
-from ollama_reasoner import ollama_judge
+from llm_scheduler import schedule_judgment
+from verdict_cache import lookup_verdict, store_verdict
+from llm_gate import should_invoke_llm, record_llm_agreement, in_uncertainty_band
+from verdict_distiller import distilled_judgment, log_llm_verdict
+from verdict_distiller import distillation_enabled, logging_enabled
 from bias_detector import rule_based_bias_check
-from text_normalizer import normalize_text
-from multi_claim_splitter import split_claims
-from claim_propagator import propagate_subject
+from request_context import RequestContext
+from fused_scorer import FusedScorer
+from model_export import export_matches_pickles, load_exported_models
 
 # -------------------------------
 # LOAD MODELS
 # -------------------------------
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
-tfidf = joblib.load(os.path.join(BASE_DIR, "tfidf_vectorizer.pkl"))
-hallucination_flag_model = joblib.load(os.path.join(BASE_DIR, "hallucination_flag_model.pkl"))
-hallucination_type_model = joblib.load(os.path.join(BASE_DIR, "hallucination_type_model.pkl"))
-bias_flag_model = joblib.load(os.path.join(BASE_DIR, "bias_flag_model.pkl"))
-bias_type_model = joblib.load(os.path.join(BASE_DIR, "bias_type_model.pkl"))
+# "auto" serves the pickle-free export (model_export.py) when one
+# exists and was built from the current pickles, "export" requires
+# it, "pickle" always uses the joblib files.
+# Either way tfidf is the trained featurizer, vocabulary TF-IDF or
+# hashed (FEATURIZER in train_models.py).
+MODEL_FORMAT = os.environ.get("MODEL_FORMAT", "auto")
+MODEL_EXPORT_DIR = os.environ.get(
+    "MODEL_EXPORT_DIR",
+    os.path.join(BASE_DIR, "model_export")
+)
+
+if MODEL_FORMAT == "export" or (
+    MODEL_FORMAT == "auto" and export_matches_pickles(MODEL_EXPORT_DIR, BASE_DIR)
+):
+    tfidf, fused_scorer = load_exported_models(MODEL_EXPORT_DIR)
+
+else:
+    tfidf = joblib.load(os.path.join(BASE_DIR, "tfidf_vectorizer.pkl"))
+
+    fused_scorer = FusedScorer.from_models(
+        joblib.load(os.path.join(BASE_DIR, "hallucination_flag_model.pkl")),
+        joblib.load(os.path.join(BASE_DIR, "hallucination_type_model.pkl")),
+        joblib.load(os.path.join(BASE_DIR, "bias_flag_model.pkl")),
+        joblib.load(os.path.join(BASE_DIR, "bias_type_model.pkl"))
+    )
 
 
-def run_pipeline(input_text: str) -> dict:
-    original_input = input_text
-    input_text = normalize_text(input_text)
-    claims, connectors = split_claims(input_text)
+NOT_APPLICABLE_TYPES = ["QUESTION", "OPINION_REQUEST"]
 
-    claims = propagate_subject(claims)
-    output = {
+# Claim status when evidence sources failed; aggregates as Unverifiable.
+EVIDENCE_UNAVAILABLE = "Evidence unavailable"
+
+# Speculative LLM calls (opt-in): statements whose hallucination
+# probability reaches the threshold get their LLM judgment started
+# in the background while evidence is fetched. Unused ones are
+# cancelled once the decision is made.
+LLM_SPECULATIVE = os.environ.get("LLM_SPECULATIVE", "0") == "1"
+LLM_SPECULATIVE_THRESHOLD = float(os.environ.get("LLM_SPECULATIVE_THRESHOLD", "0.8"))
+LLM_SPECULATIVE_WORKERS = int(os.environ.get("LLM_SPECULATIVE_WORKERS", "4"))
+
+_speculative_pool = ThreadPoolExecutor(
+    max_workers=LLM_SPECULATIVE_WORKERS,
+    thread_name_prefix="llm-speculative"
+)
+
+
+def prepare_input(input_text: str) -> RequestContext:
+    """
+    Normalizes, splits and classifies one raw input. The returned
+    context is what every later stage reads from.
+    """
+
+    return RequestContext(input_text)
+
+
+def not_applicable_output(input_text: str) -> dict:
+
+    return {
         "input_statement": input_text,
         "hallucination_detected": False,
         "hallucination_type": "none",
         "bias_detected": False,
         "bias_type": "none",
-        "truth_status": "Unverifiable",
-        "corrected_statement": "",
+        "truth_status": "Not Applicable",
+        "corrected_statement": (
+            "This input is a question or opinion request, not a factual claim. "
+            "Hallucination and bias detection are not applicable."
+        ),
         "sources": [],
-        "explanation": ""
+        "evidence_status": "not_checked",
+        "explanation": (
+            "The system detected that the input is not a verifiable factual statement. "
+            "Therefore, hallucination and bias analysis was skipped."
+        )
     }
 
+
+def score_texts(texts) -> list:
+    """
+    ML risk estimation for a batch of normalized texts.
+
+    Runs one sparse TF-IDF transform, then the fused scorer:
+    both flag heads in one product, and the type heads only for
+    rows whose flag is set (others get type "none"). Flag heads
+    also report their positive-class probability (h_prob, b_prob).
+    """
+
+    if not texts:
+        return []
+
+    return fused_scorer.score(tfidf.transform(list(texts)))
+
+
+def score_contexts(contexts):
+    """
+    score_texts over prepared contexts; each context gets its
+    scores and the time of the shared batch pass.
+    """
+
+    if not contexts:
+        return
+
+    start = time.perf_counter()
+    scores = score_texts([ctx.text for ctx in contexts])
+    elapsed = time.perf_counter() - start
+
+    for ctx, ctx_scores in zip(contexts, scores):
+        ctx.scores = ctx_scores
+        ctx.timings["score"] = elapsed
+
+
+def attach_debug(output, ctx, debug):
+
+    if debug:
+        output["debug"] = ctx.debug_info()
+
+    return output
+
+
+def run_pipeline(input_text: str, debug: bool = False) -> dict:
+    """
+    debug=True adds the request context (normalized text, tokens,
+    phrase hits, parsed claims, scores, per-stage timings and
+    intermediate results) to the output under "debug".
+    """
+
     # -------------------------------
     # 1. NORMALIZATION
     # -------------------------------
+    ctx = prepare_input(input_text)
 
-    claims_text = claims
-    statement_type = classify_statement(input_text)
+    # -------------------------------
+    # 0. INPUT ELIGIBILITY CHECK
+    # -------------------------------
+    if ctx.statement_type in NOT_APPLICABLE_TYPES:
+        return attach_debug(not_applicable_output(ctx.text), ctx, debug)
 
     # -------------------------------
-# 0. INPUT ELIGIBILITY CHECK
-# -------------------------------
-    if statement_type in ["QUESTION", "OPINION_REQUEST"]:
-        return {
-            "input_statement": input_text,
-            "hallucination_detected": False,
-            "hallucination_type": "none",
-            "bias_detected": False,
-            "bias_type": "none",
-            "truth_status": "Not Applicable",
-            "corrected_statement": (
-                "This input is a question or opinion request, not a factual claim. "
-                "Hallucination and bias detection are not applicable."
-        ),
-            "sources": [],
-            "explanation": (
-                "The system detected that the input is not a verifiable factual statement. "
-                "Therefore, hallucination and bias analysis was skipped."
+    # 2. ML RISK ESTIMATION
+    # -------------------------------
+    score_contexts([ctx])
+
+    speculation = start_speculation(ctx)
+
+    try:
+
+        with request_scope():
+
+            prefetch_evidence([ctx])
+
+            output = finish_pipeline(ctx, speculation=speculation)
+
+    finally:
+        cancel_speculations([speculation])
+
+    return attach_debug(output, ctx, debug)
+
+
+def run_pipeline_batch(texts, debug: bool = False) -> list:
+    """
+    Batch variant of run_pipeline.
+
+    Normalizes, classifies and splits every input, scores all
+    eligible inputs in one vectorized ML pass, then finishes
+    each item independently. Results keep the input order.
+    """
+
+    contexts = [prepare_input(text) for text in texts]
+
+    eligible = [
+        ctx
+        for ctx in contexts
+        if ctx.statement_type not in NOT_APPLICABLE_TYPES
+    ]
+
+    score_contexts(eligible)
+
+    speculations = {
+        id(ctx): start_speculation(ctx)
+        for ctx in eligible
+    }
+
+    results = []
+
+    try:
+
+        with request_scope():
+
+            prefetch_evidence(eligible)
+
+            for ctx in contexts:
+
+                if ctx.scores is None:
+                    output = not_applicable_output(ctx.text)
+                else:
+                    output = finish_pipeline(
+                        ctx,
+                        speculation=speculations[id(ctx)]
+                    )
+
+                results.append(attach_debug(output, ctx, debug))
+
+    finally:
+        cancel_speculations(speculations.values())
+
+    return results
+
+
+async def run_pipeline_async(input_text: str, debug: bool = False) -> dict:
+    """
+    Asyncio variant of run_pipeline.
+
+    All claims of the statement are verified concurrently, so
+    latency is bounded by the slowest claim instead of the sum.
+    """
+
+    results = await run_pipeline_batch_async([input_text], debug)
+
+    return results[0]
+
+
+async def run_pipeline_batch_async(texts, debug: bool = False) -> list:
+    """
+    Asyncio variant of run_pipeline_batch.
+
+    Every claim of every statement is fanned out at once. The
+    blocking evidence clients run in worker threads, and
+    evidence_http caps in-flight requests per host.
+    """
+
+    contexts = [prepare_input(text) for text in texts]
+
+    eligible = [
+        ctx
+        for ctx in contexts
+        if ctx.statement_type not in NOT_APPLICABLE_TYPES
+    ]
+
+    score_contexts(eligible)
+
+    async def verify_all(ctx):
+
+        with ctx.stage("verify"):
+            return await asyncio.gather(
+                *(
+                    asyncio.to_thread(verify_claim, claim_text, claim)
+                    for claim_text, claim in zip(ctx.claims, ctx.parsed_claims)
+                )
+            )
+
+    async def finish(ctx):
+
+        if ctx.scores is None:
+            return attach_debug(not_applicable_output(ctx.text), ctx, debug)
+
+        claim_outputs = await verify_all(ctx)
+
+        output = await asyncio.to_thread(
+            finish_pipeline,
+            ctx,
+            claim_outputs,
+            speculations[id(ctx)]
         )
+
+        return attach_debug(output, ctx, debug)
+
+    speculations = {
+        id(ctx): start_speculation(ctx)
+        for ctx in eligible
     }
 
+    try:
 
-    # -------------------------------
-    # 2. ML RISK ESTIMATION
-    # -------------------------------
-    X = tfidf.transform([input_text])
+        with request_scope():
+
+            await asyncio.to_thread(prefetch_evidence, eligible)
+
+            return list(
+                await asyncio.gather(*(finish(ctx) for ctx in contexts))
+            )
+
+    finally:
+        cancel_speculations(speculations.values())
+
+
+class SpeculativeJudgment:
+    """
+    llm_judgment running in the background before the decision
+    logic knows whether it will be needed.
+    """
+
+    def __init__(self, input_text):
+
+        self.cancelled = threading.Event()
+        self.future = _speculative_pool.submit(
+            llm_judgment,
+            input_text,
+            self.cancelled
+        )
 
-    h_pred = int(hallucination_flag_model.predict(X)[0])
-    h_type_pred = str(hallucination_type_model.predict(X)[0])
+    def result(self) -> dict:
 
-    b_pred = int(bias_flag_model.predict(X)[0])
-    b_type_pred = str(bias_type_model.predict(X)[0])
+        return self.future.result()
+
+    def cancel(self):
+
+        if not self.future.cancel():
+            self.cancelled.set()
+
+
+def start_speculation(ctx):
+    """
+    Starts the LLM judgment early for statements that will very
+    likely need it; None when speculation is off or not worth it.
+    """
+
+    scores = ctx.scores
+
+    if (
+        LLM_SPECULATIVE
+        and scores["h_pred"]
+        and scores["h_prob"] >= LLM_SPECULATIVE_THRESHOLD
+        and in_uncertainty_band(scores["h_prob"])
+    ):
+        ctx.record("speculative_llm", True)
+
+        return SpeculativeJudgment(ctx.text)
+
+    return None
+
+
+def cancel_speculations(speculations):
+
+    for speculation in speculations:
+
+        if speculation is not None:
+            speculation.cancel()
+
+
+def prefetch_evidence(contexts):
+    """
+    Batch-resolves the Wikidata and Wikipedia lookups for every
+    claim of every statement before they are verified one by one.
+    """
+
+    start = time.perf_counter()
+
+    claims = []
+    wiki_queries = []
+
+    for ctx in contexts:
+
+        for claim_text, claim in zip(ctx.claims, ctx.parsed_claims):
+
+            if claim["type"] == "structured":
+                claims.append(claim)
+            else:
+                wiki_queries.append(claim_text)
+
+    wiki_queries.extend(prefetch_structured_claims(claims))
+
+    if wiki_queries:
+        query_wikipedia_summaries(wiki_queries)
+
+    elapsed = time.perf_counter() - start
+
+    for ctx in contexts:
+        ctx.timings["prefetch"] = elapsed
+
+
+def verify_claim(claim_text, claim=None):
+    """
+    Verifies a single split claim; claim is its normalize_claim()
+    result if already parsed. Returns (truth_status, sources).
+
+    truth_status is EVIDENCE_UNAVAILABLE instead of "Unverifiable"
+    when an evidence source failed or its circuit breaker was open,
+    so the claim could not really be checked.
+    """
+
+    failures_before = transient_failure_count()
+
+    if claim is None:
+        claim = normalize_claim(claim_text)
+
+    if claim["type"] == "structured":
+
+        truth_status, claim_sources = verify_structured_claim(claim)
+
+    else:
+
+        wiki = query_wikipedia_summary(
+            claim_text
+        )
+
+        if wiki:
+            truth_status, claim_sources = "Partially true", [wiki]
+        else:
+            truth_status, claim_sources = "Unverifiable", []
+
+    if (
+        truth_status == "Unverifiable"
+        and transient_failure_count() != failures_before
+    ):
+        return EVIDENCE_UNAVAILABLE, claim_sources
+
+    return truth_status, claim_sources
+
+
+def llm_judgment(input_text, cancel=None):
+    """
+    LLM judgment for a statement: the persistent verdict cache
+    first, then the distilled verdict model when it is confident,
+    then a scheduled generation.
+
+    cancel is an optional threading.Event for speculative calls.
+    """
+
+    llm = lookup_verdict(input_text)
+
+    if llm is not None:
+        return llm
+
+    features = None
+
+    if distillation_enabled() or logging_enabled():
+        features = tfidf.transform([input_text])
+
+    if distillation_enabled():
+        llm = distilled_judgment(input_text, features)
+
+        if llm is not None:
+            return llm
+
+    llm = schedule_judgment(input_text, cancel=cancel)
+
+    store_verdict(input_text, llm)
+
+    if features is not None:
+        log_llm_verdict(input_text, features, llm)
+
+    return llm
+
+
+def finish_pipeline(ctx, claim_outputs=None, speculation=None) -> dict:
+    """
+    Rule-based bias, fact verification, LLM reasoning and
+    final decision for one prepared, already scored input.
+
+    claim_outputs may carry precomputed (truth_status, sources)
+    pairs, one per claim; otherwise claims are verified here.
+    speculation is an already started SpeculativeJudgment whose
+    result replaces the LLM call if one is needed.
+    """
+
+    input_text = ctx.text
+    connectors = ctx.connectors
+    statement_type = ctx.statement_type
+    scores = ctx.scores
+
+    h_pred = scores["h_pred"]
+    h_type_pred = scores["h_type_pred"]
+
+    b_pred = scores["b_pred"]
+    b_type_pred = scores["b_type_pred"]
+
+    output = {
+        "input_statement": input_text,
+        "hallucination_detected": False,
+        "hallucination_type": "none",
+        "bias_detected": False,
+        "bias_type": "none",
+        "truth_status": "Unverifiable",
+        "corrected_statement": "",
+        "sources": [],
+        "evidence_status": "available",
+        "explanation": ""
+    }
 
     # Rule-based bias (backstop)
-    rule_bias, rule_bias_type = rule_based_bias_check(input_text)
+    rule_bias, rule_bias_type = rule_based_bias_check(input_text, ctx.hits)
 
     output["bias_detected"] = bool(b_pred) or rule_bias
 
@@ -98,32 +523,19 @@ def run_pipeline(input_text: str) -> dict:
     # -------------------------------
     # 3. FACT VERIFICATION
     # -------------------------------
-    sources = []
+    if claim_outputs is None:
 
-    claim_results = []
-
-    for claim_text in claims_text:
-
-        claim = normalize_claim(claim_text)
-
-        if claim["type"] == "structured":
-
-            truth_status, claim_sources = (
-                verify_structured_claim(claim)
-            )
+        with ctx.stage("verify"):
+            claim_outputs = [
+                verify_claim(claim_text, claim)
+                for claim_text, claim in zip(ctx.claims, ctx.parsed_claims)
+            ]
 
-        else:
+    sources = []
 
-            wiki = query_wikipedia_summary(
-                claim_text
-            )
+    claim_results = []
 
-            if wiki:
-                truth_status = "Partially true"
-                claim_sources = [wiki]
-            else:
-                truth_status = "Unverifiable"
-                claim_sources = []
+    for truth_status, claim_sources in claim_outputs:
 
         claim_results.append(truth_status)
 
@@ -163,6 +575,12 @@ def run_pipeline(input_text: str) -> dict:
 
     output["truth_status"] = truth_status
     output["sources"] = sources
+
+    ctx.record("claim_results", claim_results)
+    ctx.record("aggregated_truth_status", truth_status)
+
+    if EVIDENCE_UNAVAILABLE in claim_results:
+        output["evidence_status"] = "unavailable"
     # -------------------------------
     # 4. CONTRADICTION CHECK
     # -------------------------------
@@ -170,9 +588,12 @@ def run_pipeline(input_text: str) -> dict:
 
         contradiction = check_contradiction(
             input_text,
-            sources[0]["text"]
+            sources[0]["text"],
+            ctx.hits
         )
 
+        ctx.record("contradiction", contradiction)
+
         if contradiction:
             output["truth_status"] = "False"
     # -------------------------------
@@ -200,8 +621,30 @@ def run_pipeline(input_text: str) -> dict:
     # -------------------------------
     # 6. OLLAMA (SAFE USE)
     # -------------------------------
-    if output["truth_status"] in ["Unverifiable", "Partially true"] and output["hallucination_detected"]:
-        llm = ollama_judge(input_text)
+    use_llm = (
+        output["truth_status"] in ["Unverifiable", "Partially true"]
+        and output["hallucination_detected"]
+        and should_invoke_llm(scores["h_prob"])
+    )
+
+    if not use_llm and speculation is not None:
+        # Free the LLM slot now, not when the whole batch is done
+        speculation.cancel()
+
+    if use_llm:
+        with ctx.stage("llm"):
+
+            if speculation is not None:
+                llm = speculation.result()
+            else:
+                llm = llm_judgment(input_text)
+
+        ctx.record("llm_judgment", llm)
+
+        # Distilled verdicts imitate the LLM; counting them would
+        # inflate the agreement used to judge distillation
+        if not llm.get("distilled"):
+            record_llm_agreement(h_pred, llm["verdict"])
 
         if llm["verdict"] == "false":
             output["truth_status"] = "False"
@@ -249,4 +692,9 @@ def run_pipeline(input_text: str) -> dict:
         f"rule-based bias detection, and local LLM commonsense reasoning."
     )
 
+    if output["evidence_status"] == "unavailable":
+        output["explanation"] += (
+            " Evidence sources were unavailable, so some claims could not be verified."
+        )
+
     return output
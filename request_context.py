@@ -0,0 +1,138 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from text_normalizer import normalize_text
+from multi_claim_splitter import split_claims
+from claim_propagator import propagate_subject
+from statement_classifier import classify_statement
+from claim_normalizer import normalize_claim
+from phrase_scanner import scan
+
+
+def tokenize(text: str) -> list:
+    """
+    (token, start, end) for every space-separated token.
+    """
+
+    tokens = []
+    start = 0
+
+    for token in text.split(" "):
+
+        if token:
+            tokens.append((token, start, start + len(token)))
+
+        start += len(token) + 1
+
+    return tokens
+
+
+class RequestContext:
+    """
+    One input analysed once: normalized text, phrase hits, claims
+    and statement type, shared by every pipeline stage.
+
+    Stages also record their timings and intermediate results
+    here, which debug_info() returns for debugging.
+    """
+
+    def __init__(self, raw_text):
+
+        self.raw_text = raw_text
+
+        self.timings = {}
+        self.intermediates = {}
+        self._lock = threading.Lock()
+
+        with self.stage("normalize"):
+            self.text = normalize_text(raw_text)
+
+        with self.stage("scan"):
+            self.hits = scan(self.text)
+
+        with self.stage("split"):
+            claims, self.connectors = split_claims(self.text)
+            self.claims = propagate_subject(claims)
+
+        with self.stage("classify"):
+            self.statement_type = classify_statement(self.text, self.hits)
+
+        self.scores = None
+        self._parsed_claims = None
+        self._tokens = None
+
+    @property
+    def tokens(self) -> list:
+        """
+        tokenize() of the text, computed on first use. No stage needs
+        it, so only debug_info() pays for it.
+        """
+
+        if self._tokens is None:
+            self._tokens = tokenize(self.text)
+
+        return self._tokens
+
+    @property
+    def parsed_claims(self) -> list:
+        """
+        normalize_claim() of every claim, computed on first use.
+        """
+
+        if self._parsed_claims is None:
+
+            with self.stage("normalize_claims"):
+                self._parsed_claims = [
+                    normalize_claim(claim_text)
+                    for claim_text in self.claims
+                ]
+
+        return self._parsed_claims
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Adds the time spent in the block to timings[name].
+        """
+
+        start = time.perf_counter()
+
+        try:
+            yield
+
+        finally:
+            elapsed = time.perf_counter() - start
+
+            with self._lock:
+                self.timings[name] = self.timings.get(name, 0.0) + elapsed
+
+    def record(self, name, value):
+
+        with self._lock:
+            self.intermediates[name] = value
+
+    def debug_info(self) -> dict:
+
+        with self._lock:
+            timings = dict(self.timings)
+            intermediates = dict(self.intermediates)
+
+        return {
+            "normalized_text": self.text,
+            "tokens": self.tokens,
+            "phrase_hits": {
+                lexicon: self.hits.phrases(lexicon)
+                for lexicon in self.hits.by_lexicon
+            },
+            "statement_type": self.statement_type,
+            "claims": self.claims,
+            "connectors": self.connectors,
+            "parsed_claims": self._parsed_claims,
+            "scores": self.scores,
+            "timings_ms": {
+                name: round(seconds * 1000, 3)
+                for name, seconds in timings.items()
+            },
+            "intermediates": intermediates
+        }
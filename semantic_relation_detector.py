@@ -1,5 +1,7 @@
 # semantic_relation_detector.py
 
+from phrase_scanner import register_lexicon, scan
+
 RELATION_PATTERNS = {
 
     "nationality": [
@@ -36,15 +38,12 @@ RELATION_PATTERNS = {
 }
 
 
-def detect_relation(text):
-
-    text = text.lower()
+RELATION_LEXICON = register_lexicon("relation", RELATION_PATTERNS)
 
-    for relation, patterns in RELATION_PATTERNS.items():
 
-        for pattern in patterns:
+def detect_relation(text, hits=None):
 
-            if pattern in text:
-                return relation
+    if hits is None:
+        hits = scan(text)
 
-    return None
\ No newline at end of file
+    return hits.first(RELATION_LEXICON)
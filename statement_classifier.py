@@ -1,15 +1,67 @@
-def classify_statement(text: str) -> str:
+from phrase_scanner import register_lexicon, scan
+
+COMPARISON_LEXICON = register_lexicon("classifier.comparison", [
+    "taller than",
+    "higher than",
+    "larger than",
+    "bigger than"
+])
+
+QUESTION_STARTERS = register_lexicon("classifier.question_start", [
+    "what", "why", "how", "who", "when", "where", "which",
+    "do you", "can you", "could you", "should we", "tell me"
+])
+
+OPINION_REQUESTS = register_lexicon("classifier.opinion_request", [
+    "what do you think",
+    "your opinion",
+    "do you believe",
+    "i think",
+    "in my opinion"
+])
+
+EXTREME_WORDS = register_lexicon("classifier.extreme", [
+    "poorest", "richest", "best", "worst", "largest", "smallest",
+    "fastest", "slowest", "most", "least"
+])
+
+NUMERICAL_WORDS = register_lexicon("classifier.numerical", [
+    "has", "number of", "total", "count"
+])
+
+HARD_FACT_WORDS = register_lexicon("classifier.hard_fact", [
+    "capital",
+    "located",
+    "situated",
+    "inside",
+    "part of",
+    "is in",
+    "invented",
+    "founded",
+    "discovered",
+    "born",
+    "died",
+    "nationality",
+    "citizenship",
+    "citizen of",
+    "worked as",
+    "occupation",
+    "profession"
+])
+
+GENERALIZATION_WORDS = register_lexicon("classifier.generalization", [
+    "always", "never", "naturally", "all", "none",
+    "everyone", "nobody"
+])
+
+
+def classify_statement(text: str, hits=None) -> str:
     text = text.strip().lower()
 
-    if any(
-        phrase in text
-        for phrase in [
-            "taller than",
-            "higher than",
-            "larger than",
-            "bigger than"
-        ]
-    ):
+    if hits is None:
+        hits = scan(text)
+
+    if hits.has(COMPARISON_LEXICON):
         return "HARD_FACT"
 
     # -------------------------------------------------
@@ -18,74 +70,33 @@ def classify_statement(text: str) -> str:
     if text.endswith("?"):
         return "QUESTION"
 
-    question_starters = [
-        "what", "why", "how", "who", "when", "where", "which",
-        "do you", "can you", "could you", "should we", "tell me"
-    ]
-
-    for q in question_starters:
-        if text.startswith(q):
-            return "QUESTION"
-
-    opinion_requests = [
-        "what do you think",
-        "your opinion",
-        "do you believe",
-        "i think",
-        "in my opinion"
-    ]
+    if hits.at_start(QUESTION_STARTERS):
+        return "QUESTION"
 
-    for op in opinion_requests:
-        if op in text:
-            return "OPINION_REQUEST"    
+    if hits.has(OPINION_REQUESTS):
+        return "OPINION_REQUEST"
 
     # -------------------------------------------------
     # 1. COMPARATIVE / EXTREME CLAIMS
     # -------------------------------------------------
-    if any(word in text for word in [
-        "poorest", "richest", "best", "worst", "largest", "smallest",
-        "fastest", "slowest", "most", "least"
-    ]):
+    if hits.has(EXTREME_WORDS):
         return "COMPARATIVE"
 
     # -------------------------------------------------
     # 2. NUMERICAL CLAIMS
     # -------------------------------------------------
-    if any(word in text for word in [
-        "has", "number of", "total", "count"
-    ]) and any(char.isdigit() for char in text):
+    if hits.has(NUMERICAL_WORDS) and any(char.isdigit() for char in text):
         return "NUMERICAL"
 
     # -------------------------------------------------
     # 3. HARD FACTUAL RELATIONS
     # -------------------------------------------------
-    if any(word in text for word in [
-        "capital",
-        "located",
-        "situated",
-        "inside",
-        "part of",
-        "is in",
-        "invented",
-        "founded",
-        "discovered",
-        "born",
-        "died",
-        "nationality",
-        "citizenship",
-        "citizen of",
-        "worked as",
-        "occupation",
-        "profession"
-    ]):
+    if hits.has(HARD_FACT_WORDS):
         return "HARD_FACT"
     # -------------------------------------------------
     # 4. GENERALIZATION / STEREOTYPE OPINIONS
     # -------------------------------------------------
-    if any(word in text for word in [
-        "always", "never", "naturally", "all", "none",
-        "everyone", "nobody"
-    ]):
+    if hits.has(GENERALIZATION_WORDS):
         return "OPINION"
 
     # -------------------------------------------------
@@ -0,0 +1,157 @@
+import argparse
+import json
+import os
+import sys
+
+import joblib
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import train_test_split
+
+from verdict_distiller import DISTILL_LOG_PATH, DISTILLED_MODEL_PATH, DISTILL_THRESHOLD
+
+# Below this many examples of a class the bias-type head is skipped
+MIN_BIAS_EXAMPLES = 5
+
+
+# -------------------------------------------------
+# LOAD LOGGED LLM VERDICTS
+# -------------------------------------------------
+def load_log(path):
+    """
+    Reads the distillation log into a sparse matrix plus labels.
+    Later entries for the same statement win.
+    """
+
+    records = {}
+
+    if not os.path.exists(path):
+        sys.exit(f"No distillation log at {path}; run the pipeline with LLM_DISTILL_LOG set first.")
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+
+            if line:
+                record = json.loads(line)
+                records[record["statement"]] = record
+
+    records = list(records.values())
+
+    if not records:
+        sys.exit(f"No LLM verdicts logged in {path} yet; nothing to distill.")
+
+    n_features = max(r["n_features"] for r in records)
+    records = [r for r in records if r["n_features"] == n_features]
+
+    data, indices, indptr = [], [], [0]
+
+    for r in records:
+        data.extend(r["values"])
+        indices.extend(r["indices"])
+        indptr.append(len(indices))
+
+    X = csr_matrix((data, indices, indptr), shape=(len(records), n_features))
+
+    y_verdict = np.array([r["verdict"] for r in records])
+    y_bias = np.array([r["bias"] for r in records])
+    y_bias_type = np.array([r["bias_type"] for r in records])
+
+    return X, y_verdict, y_bias, y_bias_type, n_features
+
+
+# -------------------------------------------------
+# COVERAGE / ACCURACY AT THE SERVING THRESHOLD
+# -------------------------------------------------
+def report(name, model, X_te, y_te, threshold):
+    probs = model.predict_proba(X_te)
+    preds = model.classes_[probs.argmax(axis=1)]
+    confident = probs.max(axis=1) >= threshold
+
+    print(f"\n{name}")
+    print("Accuracy (all):", accuracy_score(y_te, preds))
+
+    if confident.any():
+        print(f"Coverage at p>={threshold}: {confident.mean() * 100:.1f}%")
+        print("Accuracy (confident):", accuracy_score(y_te[confident], preds[confident]))
+    else:
+        print(f"Coverage at p>={threshold}: 0%")
+
+
+def train_distilled_model(log_path, model_path, threshold):
+    X, y_verdict, y_bias, y_bias_type, n_features = load_log(log_path)
+
+    print("Logged LLM verdicts:", X.shape[0])
+
+    if len(set(y_verdict)) < 2:
+        sys.exit("The logged LLM verdicts cover a single verdict; log more before distilling.")
+
+    indices = np.arange(X.shape[0])
+    train_idx, test_idx = train_test_split(indices, test_size=0.2, random_state=42)
+
+    verdict_model = LogisticRegression(max_iter=2000, class_weight="balanced")
+    verdict_model.fit(X[train_idx], y_verdict[train_idx])
+    report("Distilled Verdict Model", verdict_model, X[test_idx], y_verdict[test_idx], threshold)
+
+    bias_model = LogisticRegression(max_iter=2000, class_weight="balanced")
+
+    if len(set(y_bias[train_idx])) < 2:
+        # Only one bias label seen: a constant head
+        bias_model = None
+    else:
+        bias_model.fit(X[train_idx], y_bias[train_idx])
+        report("Distilled Bias Model", bias_model, X[test_idx], y_bias[test_idx], threshold)
+
+    # Training split only, like the other heads
+    bias_rows = train_idx[y_bias[train_idx] == "yes"]
+    bias_type_model = None
+    bias_type_default = "none"
+
+    if bias_rows.size:
+        types, counts = np.unique(y_bias_type[bias_rows], return_counts=True)
+        bias_type_default = str(types[counts.argmax()])
+
+    if bias_rows.size >= MIN_BIAS_EXAMPLES and len(types) > 1:
+        bias_type_model = LogisticRegression(max_iter=2000)
+        bias_type_model.fit(X[bias_rows], y_bias_type[bias_rows])
+
+        test_bias_rows = test_idx[y_bias[test_idx] == "yes"]
+
+        if test_bias_rows.size:
+            report(
+                "Distilled Bias Type Model",
+                bias_type_model,
+                X[test_bias_rows],
+                y_bias_type[test_bias_rows],
+                threshold
+            )
+
+    if bias_model is None:
+        print("\nNot enough bias variety in the log; distilled model not saved.")
+        return
+
+    joblib.dump(
+        {
+            "n_features": n_features,
+            "verdict_model": verdict_model,
+            "bias_model": bias_model,
+            "bias_type_model": bias_type_model,
+            "bias_type_default": bias_type_default
+        },
+        model_path
+    )
+
+    print(f"\nDistilled model saved to {model_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Distill logged LLM verdicts into a fast local model.")
+    parser.add_argument("--log", default=DISTILL_LOG_PATH or "llm_distill_log.jsonl")
+    parser.add_argument("--out", default=DISTILLED_MODEL_PATH)
+    parser.add_argument("--threshold", type=float, default=DISTILL_THRESHOLD)
+
+    args = parser.parse_args()
+
+    train_distilled_model(args.log, args.out, args.threshold)
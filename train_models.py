@@ -1,16 +1,29 @@
+import os
+
 import joblib
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score, f1_score, classification_report
 
-from data_preprocessing import load_dataset, preprocess_dataset, get_training_sets
-from feature_extraction import build_tfidf_features
+from data_preprocessing import PREPROCESS_COLUMNS, load_dataset, preprocess_dataset, get_training_sets
+from feature_extraction import build_tfidf_features, build_hashing_features
+from model_export import export_models
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+# "tfidf": fitted vocabulary capped at 6000 terms.
+# "hashing": hashed buckets with stored IDF, no vocabulary, so
+# HASHING_FEATURES can grow without growing per-worker memory.
+# Corpora too large for memory: train_models_streaming.py.
+FEATURIZER = os.environ.get("FEATURIZER", "tfidf")
+HASHING_FEATURES = int(os.environ.get("HASHING_FEATURES", str(2 ** 20)))
 
 # -------------------------------------------------
 # LOAD & PREPARE DATA
 # -------------------------------------------------
-df = load_dataset()
+df = load_dataset(columns=PREPROCESS_COLUMNS)
 df_clean = preprocess_dataset(df)
 
 (
@@ -24,12 +37,24 @@ df_clean = preprocess_dataset(df)
 # -------------------------------------------------
 # TF-IDF FEATURES (OPTIMIZED FOR SHORT SENTENCES)
 # -------------------------------------------------
-vectorizer, X_tfidf = build_tfidf_features(
-    X_text,
-    max_features=6000,
-    ngram_range=(1, 2),
-    min_df=2
-)
+if FEATURIZER == "hashing":
+    vectorizer, X_tfidf = build_hashing_features(
+        X_text,
+        n_features=HASHING_FEATURES,
+        ngram_range=(1, 2),
+        min_df=2
+    )
+
+elif FEATURIZER == "tfidf":
+    vectorizer, X_tfidf = build_tfidf_features(
+        X_text,
+        max_features=6000,
+        ngram_range=(1, 2),
+        min_df=2
+    )
+
+else:
+    raise ValueError(f"Unknown FEATURIZER: {FEATURIZER}")
 
 # -------------------------------------------------
 # SINGLE CONSISTENT SPLIT
@@ -50,8 +75,8 @@ y_b_flag_train, y_b_flag_test = y_b_flag[train_idx], y_b_flag[test_idx]
 # -------------------------------------------------
 # HALLUCINATION TYPE (ONLY WHERE hallucination == 1)
 # -------------------------------------------------
-mask_train_h = y_h_flag_train == 1
-mask_test_h = y_h_flag_test == 1
+mask_train_h = np.asarray(y_h_flag_train == 1)
+mask_test_h = np.asarray(y_h_flag_test == 1)
 
 X_train_h = X_train[mask_train_h]
 X_test_h = X_test[mask_test_h]
@@ -62,8 +87,8 @@ y_h_type_test = y_h_type[test_idx][mask_test_h]
 # -------------------------------------------------
 # BIAS TYPE (ONLY WHERE bias == 1)
 # -------------------------------------------------
-mask_train_b = y_b_flag_train == 1
-mask_test_b = y_b_flag_test == 1
+mask_train_b = np.asarray(y_b_flag_train == 1)
+mask_test_b = np.asarray(y_b_flag_test == 1)
 
 X_train_b = X_train[mask_train_b]
 X_test_b = X_test[mask_test_b]
@@ -119,10 +144,23 @@ bias_type_model = train_and_evaluate(
 # -------------------------------------------------
 # SAVE ARTIFACTS
 # -------------------------------------------------
+# The fitted featurizer, whichever FEATURIZER trained it
 joblib.dump(vectorizer, "tfidf_vectorizer.pkl")
 joblib.dump(hallucination_flag_model, "hallucination_flag_model.pkl")
 joblib.dump(hallucination_type_model, "hallucination_type_model.pkl")
 joblib.dump(bias_flag_model, "bias_flag_model.pkl")
 joblib.dump(bias_type_model, "bias_type_model.pkl")
 
+# Pickle-free, memory-mappable copy served by pipeline.py
+export_dir = export_models(
+    "model_export",
+    vectorizer,
+    hallucination_flag_model,
+    hallucination_type_model,
+    bias_flag_model,
+    bias_type_model,
+    pickle_dir="."
+)
+
 print("\nAll models retrained and saved successfully.")
+print(f"Pickle-free export written to {export_dir}")
@@ -0,0 +1,318 @@
+import argparse
+
+import joblib
+import numpy as np
+from sklearn.linear_model import SGDClassifier
+
+from data_preprocessing import (
+    DATASET_PATH,
+    PREPROCESS_COLUMNS,
+    iter_dataset,
+    preprocess_dataset,
+    get_training_sets
+)
+from feature_extraction import hashing_featurizer
+from featurizers import DEFAULT_HASHING_FEATURES
+from model_export import export_models
+
+# -------------------------------------------------
+# OUT-OF-CORE TRAINING
+# -------------------------------------------------
+# train_models.py for corpora that do not fit in memory. The dataset
+# is streamed in chunks and never held whole:
+#
+#   scan pass   hashing featurizer idf, label sets, class counts
+#   epochs      SGD (log loss) partial_fit of all four heads
+#   evaluation  confusion matrices over the hold-out rows
+#
+# Memory is bounded by the chunk size and the n_features x classes
+# weights, not by the number of rows. Artifacts are the same files
+# train_models.py writes.
+
+# Every HOLDOUT_EVERY-th row of each hallucination class is held out:
+# a 20% split stratified on label_hallucination, like train_models.py,
+# and identical in every pass over the stream.
+HOLDOUT_EVERY = 5
+
+# head -> (flag head whose positive rows it trains on, balanced weights)
+HEADS = {
+    "h_flag": (None, True),
+    "h_type": ("h_flag", False),
+    "b_flag": (None, True),
+    "b_type": ("b_flag", False)
+}
+
+HEAD_NAMES = {
+    "h_flag": "Hallucination Flag Model",
+    "h_type": "Hallucination Type Model",
+    "b_flag": "Bias Flag Model",
+    "b_type": "Bias Type Model"
+}
+
+
+# -------------------------------------------------
+# STREAM OF LABELLED CHUNKS
+# -------------------------------------------------
+def labelled_chunks(path, chunk_rows):
+    """
+    Yields (texts, labels, holdout) per chunk; labels maps each head
+    to its label array, holdout marks the evaluation rows.
+    """
+
+    seen = {}
+
+    for chunk in iter_dataset(path, chunk_rows, columns=PREPROCESS_COLUMNS):
+
+        df = preprocess_dataset(chunk)
+
+        if df.empty:
+            continue
+
+        X_text, y_h_flag, y_h_type, y_b_flag, y_b_type = get_training_sets(df)
+
+        labels = {
+            "h_flag": y_h_flag.to_numpy(),
+            "h_type": y_h_type.to_numpy(),
+            "b_flag": y_b_flag.to_numpy(),
+            "b_type": y_b_type.to_numpy()
+        }
+
+        holdout = np.zeros(len(df), dtype=bool)
+
+        for i, label in enumerate(labels["h_flag"]):
+            seen[label] = seen.get(label, 0) + 1
+            holdout[i] = seen[label] % HOLDOUT_EVERY == 0
+
+        yield list(X_text), labels, holdout
+
+
+def head_rows(head, labels, rows):
+    """
+    rows restricted to the ones head trains / evaluates on.
+    """
+
+    parent = HEADS[head][0]
+
+    if parent is None:
+        return rows
+
+    return rows & (labels[parent] == 1)
+
+
+# -------------------------------------------------
+# SCAN PASS
+# -------------------------------------------------
+def scan_corpus(path, chunk_rows, featurizer):
+    """
+    Fits the featurizer idf over every row and counts the labels of
+    each head: {head: {label: (train count, holdout count)}}.
+    """
+
+    df = np.zeros(featurizer.n_features, dtype=np.int64)
+    n_texts = 0
+
+    counts = {head: {} for head in HEADS}
+
+    for texts, labels, holdout in labelled_chunks(path, chunk_rows):
+
+        df += featurizer.document_frequencies(featurizer.term_counts(texts))
+        n_texts += len(texts)
+
+        for head in HEADS:
+            for split, rows in ((0, ~holdout), (1, holdout)):
+
+                values, value_counts = np.unique(
+                    labels[head][head_rows(head, labels, rows)],
+                    return_counts=True
+                )
+
+                for value, count in zip(values, value_counts):
+                    pair = counts[head].setdefault(value, [0, 0])
+                    pair[split] += int(count)
+
+    featurizer.fit_df(df, n_texts)
+
+    return n_texts, counts
+
+
+def balanced_weights(train_counts):
+    """
+    class_weight="balanced": n_samples / (n_classes * count).
+    """
+
+    total = sum(train_counts.values())
+
+    return {
+        label: total / (len(train_counts) * count)
+        for label, count in train_counts.items()
+    }
+
+
+# -------------------------------------------------
+# EVALUATION
+# -------------------------------------------------
+def report(name, confusion, labels):
+    """
+    Accuracy, weighted F1 and per-class scores from a confusion
+    matrix (rows = true label, columns = prediction).
+    """
+
+    support = confusion.sum(axis=1)
+    predicted = confusion.sum(axis=0)
+    correct = np.diag(confusion)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.nan_to_num(correct / predicted)
+        recall = np.nan_to_num(correct / support)
+        f1 = np.nan_to_num(2 * precision * recall / (precision + recall))
+
+    total = support.sum()
+
+    print(f"\n{name}")
+    print("Accuracy:", correct.sum() / total if total else 0.0)
+    print("F1-score:", (f1 * support).sum() / total if total else 0.0)
+
+    print(f"{'':>28} {'precision':>9} {'recall':>9} {'f1-score':>9} {'support':>9}")
+
+    for i, label in enumerate(labels):
+        if support[i]:
+            print(
+                f"{str(label):>28} {precision[i]:>9.2f} {recall[i]:>9.2f} "
+                f"{f1[i]:>9.2f} {support[i]:>9}"
+            )
+
+
+# -------------------------------------------------
+# TRAINING
+# -------------------------------------------------
+def train_streaming(path, chunk_rows, epochs, n_features, alpha):
+
+    featurizer = hashing_featurizer(n_features, ngram_range=(1, 2), min_df=2)
+
+    n_texts, counts = scan_corpus(path, chunk_rows, featurizer)
+
+    print("Rows:", n_texts)
+
+    models = {}
+    classes = {}
+    weights = {}
+
+    for head, (_, balanced) in HEADS.items():
+
+        train_counts = {
+            label: pair[0]
+            for label, pair in counts[head].items()
+            if pair[0]
+        }
+
+        if len(train_counts) < 2:
+            raise ValueError(f"{HEAD_NAMES[head]} needs at least two classes to train")
+
+        classes[head] = np.array(sorted(train_counts))
+        weights[head] = balanced_weights(train_counts) if balanced else None
+
+        models[head] = SGDClassifier(loss="log_loss", alpha=alpha, random_state=42)
+
+    for epoch in range(epochs):
+
+        rng = np.random.default_rng(epoch)
+
+        for texts, labels, holdout in labelled_chunks(path, chunk_rows):
+
+            X = featurizer.transform(texts)
+
+            # Shuffle within the chunk, the stream order is fixed
+            order = rng.permutation(len(texts))
+
+            for head, model in models.items():
+
+                rows = order[head_rows(head, labels, ~holdout)[order]]
+
+                if not rows.size:
+                    continue
+
+                y = labels[head][rows]
+                sample_weight = None
+
+                if weights[head] is not None:
+                    sample_weight = np.array([weights[head][label] for label in y])
+
+                model.partial_fit(
+                    X[rows],
+                    y,
+                    classes=classes[head],
+                    sample_weight=sample_weight
+                )
+
+        print(f"Epoch {epoch + 1}/{epochs} done")
+
+    # Hold-out evaluation
+    eval_labels = {head: sorted(counts[head]) for head in HEADS}
+    position = {
+        head: {label: i for i, label in enumerate(eval_labels[head])}
+        for head in HEADS
+    }
+    confusion = {
+        head: np.zeros((len(eval_labels[head]),) * 2, dtype=np.int64)
+        for head in HEADS
+    }
+
+    for texts, labels, holdout in labelled_chunks(path, chunk_rows):
+
+        X = featurizer.transform(texts)
+
+        for head, model in models.items():
+
+            rows = np.flatnonzero(head_rows(head, labels, holdout))
+
+            if not rows.size:
+                continue
+
+            for true, pred in zip(labels[head][rows], model.predict(X[rows])):
+                confusion[head][position[head][true], position[head][pred]] += 1
+
+    for head in HEADS:
+        report(HEAD_NAMES[head], confusion[head], eval_labels[head])
+
+    return featurizer, models
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the four heads out of core, streaming the dataset in chunks.")
+    parser.add_argument("--data", default=DATASET_PATH)
+    parser.add_argument("--chunk-rows", type=int, default=10000)
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--hashing-features", type=int, default=DEFAULT_HASHING_FEATURES)
+    parser.add_argument("--alpha", type=float, default=1e-4)
+
+    args = parser.parse_args()
+
+    featurizer, models = train_streaming(
+        args.data,
+        args.chunk_rows,
+        args.epochs,
+        args.hashing_features,
+        args.alpha
+    )
+
+    # -------------------------------------------------
+    # SAVE ARTIFACTS
+    # -------------------------------------------------
+    joblib.dump(featurizer, "tfidf_vectorizer.pkl")
+    joblib.dump(models["h_flag"], "hallucination_flag_model.pkl")
+    joblib.dump(models["h_type"], "hallucination_type_model.pkl")
+    joblib.dump(models["b_flag"], "bias_flag_model.pkl")
+    joblib.dump(models["b_type"], "bias_type_model.pkl")
+
+    export_dir = export_models(
+        "model_export",
+        featurizer,
+        models["h_flag"],
+        models["h_type"],
+        models["b_flag"],
+        models["b_type"],
+        pickle_dir="."
+    )
+
+    print("\nAll models retrained and saved successfully.")
+    print(f"Pickle-free export written to {export_dir}")
@@ -0,0 +1,78 @@
+import os
+import threading
+
+from evidence_cache import PersistentCache, normalize_key
+from ollama_reasoner import OLLAMA_MODEL, PROMPT_VERSION
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Empty path disables the cache entirely.
+VERDICT_CACHE_PATH = os.environ.get(
+    "LLM_CACHE_PATH",
+    os.path.join(BASE_DIR, "llm_verdict_cache.sqlite3")
+)
+
+VERDICT_TTL = float(os.environ.get("LLM_CACHE_TTL", str(30 * 24 * 60 * 60)))
+VERDICT_MAX_ENTRIES = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", "100000"))
+
+# Size bound is enforced every this many writes.
+EVICT_EVERY = 500
+
+SOURCE = "llm"
+
+_cache = PersistentCache(VERDICT_CACHE_PATH) if VERDICT_CACHE_PATH else None
+
+_lock = threading.Lock()
+_stats = {
+    "hits": 0,
+    "misses": 0,
+    "stores": 0
+}
+
+
+def verdict_key(statement, model=OLLAMA_MODEL, prompt_version=PROMPT_VERSION):
+
+    return f"{model}|v{prompt_version}|{normalize_key(statement)}"
+
+
+def verdict_cache_stats():
+
+    with _lock:
+        return dict(_stats)
+
+
+def lookup_verdict(statement):
+    """
+    Returns the cached LLM judgment for statement, or None.
+    """
+
+    if _cache is None:
+        return None
+
+    hit, judgment = _cache.get(SOURCE, verdict_key(statement))
+
+    with _lock:
+        _stats["hits" if hit else "misses"] += 1
+
+    return judgment if hit else None
+
+
+def store_verdict(statement, judgment):
+    """
+    Caches a real LLM judgment; fallback judgments are skipped.
+    """
+
+    if _cache is None or judgment.get("fallback"):
+        return
+
+    _cache.set(SOURCE, verdict_key(statement), judgment, VERDICT_TTL)
+
+    with _lock:
+        _stats["stores"] += 1
+        evict = _stats["stores"] % EVICT_EVERY == 0
+
+    if evict:
+        _cache.evict(SOURCE, VERDICT_MAX_ENTRIES)
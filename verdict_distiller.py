@@ -0,0 +1,111 @@
+import json
+import os
+import threading
+
+import joblib
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# JSONL file collecting (statement, TF-IDF features, LLM verdict)
+# tuples for train_distilled_model.py. Empty disables logging.
+DISTILL_LOG_PATH = os.environ.get("LLM_DISTILL_LOG", "")
+
+DISTILLED_MODEL_PATH = os.environ.get(
+    "DISTILLED_MODEL_PATH",
+    os.path.join(BASE_DIR, "distilled_verdict_model.pkl")
+)
+
+# Minimum class probability (verdict and bias heads) to answer
+# without the LLM; anything less is escalated.
+DISTILL_THRESHOLD = float(os.environ.get("DISTILL_THRESHOLD", "0.9"))
+
+_log_lock = threading.Lock()
+
+_distilled = (
+    joblib.load(DISTILLED_MODEL_PATH)
+    if os.path.exists(DISTILLED_MODEL_PATH)
+    else None
+)
+
+
+def distillation_enabled():
+
+    return _distilled is not None
+
+
+def logging_enabled():
+
+    return bool(DISTILL_LOG_PATH)
+
+
+def log_llm_verdict(statement, features, judgment):
+    """
+    Appends one training tuple; features is a 1-row sparse matrix.
+    Fallback judgments carry no signal and are skipped.
+    """
+
+    if not DISTILL_LOG_PATH or judgment.get("fallback"):
+        return
+
+    row = features.tocsr()
+
+    record = {
+        "statement": statement,
+        "n_features": row.shape[1],
+        "indices": row.indices.tolist(),
+        "values": row.data.tolist(),
+        "verdict": judgment.get("verdict", "unverifiable"),
+        "bias": judgment.get("bias", "no"),
+        "bias_type": judgment.get("bias_type", "none")
+    }
+
+    line = json.dumps(record) + "\n"
+
+    with _log_lock:
+        with open(DISTILL_LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+def distilled_judgment(statement, features):
+    """
+    Judgment from the distilled model when it is confident on both
+    the verdict and the bias head; None means ask the LLM.
+    """
+
+    if _distilled is None or features.shape[1] != _distilled["n_features"]:
+        return None
+
+    verdict_model = _distilled["verdict_model"]
+    bias_model = _distilled["bias_model"]
+
+    verdict_probs = verdict_model.predict_proba(features)[0]
+    bias_probs = bias_model.predict_proba(features)[0]
+
+    if min(verdict_probs.max(), bias_probs.max()) < DISTILL_THRESHOLD:
+        return None
+
+    verdict = str(verdict_model.classes_[verdict_probs.argmax()])
+    bias = str(bias_model.classes_[bias_probs.argmax()])
+
+    bias_type = "none"
+
+    if bias == "yes":
+        bias_type_model = _distilled.get("bias_type_model")
+
+        if bias_type_model is not None:
+            bias_type = str(bias_type_model.predict(features)[0])
+        else:
+            bias_type = _distilled.get("bias_type_default", "none")
+
+    return {
+        "verdict": verdict,
+        "reasoning": f"Distilled verdict model (p={verdict_probs.max():.2f}).",
+        # No correction to offer; finish_pipeline fills in its own
+        "corrected_statement": "",
+        "bias": bias,
+        "bias_type": bias_type,
+        "distilled": True
+    }
@@ -1,5 +1,6 @@
 from evidence_wikidata import query_wikidata_capital
 from evidence_wikidata import query_wikidata_deathplace
+from evidence_wikidata import prefetch_claim_targets
 from evidence_wikipedia import query_wikipedia_summary
 from entity_resolver import entities_match
 from country_aliases import country_match
@@ -26,6 +27,95 @@ def apply_negation(truth_status, claim):
     return truth_status
 
 
+def _count_query(claim):
+
+    subject = claim["subject"].lower()
+    obj = claim["object"].lower()
+
+    # Answered by the local numeric fact database
+    if subject in NUMERIC_FACTS and obj in NUMERIC_FACTS[subject]:
+        return None
+
+    return f"{claim['subject']} {claim['object']}"
+
+
+def _no_query(claim):
+
+    return None
+
+
+# relation -> the Wikipedia query verify_structured_claim makes for a
+# claim, None if it makes none (or cannot know it before Wikidata
+# answers, as for died_in). Relations not listed query the subject.
+# verify_structured_claim and the batch prefetch both read this table.
+WIKIPEDIA_QUERIES = {
+    "capital_of": lambda claim: query_wikidata_capital(claim["object"]),
+    "count": _count_query,
+    "located_in": build_relation_query,
+    "born_in": build_relation_query,
+    "nationality": build_relation_query,
+    "occupation": build_relation_query,
+    "invented_by": build_relation_query,
+    "is_a": build_relation_query,
+    "died_in": _no_query,
+    "birth_year": _no_query,
+    "death_year": _no_query,
+    "independence_year": _no_query,
+    "end_year": _no_query,
+    "causes": _no_query,
+    "comparison": _no_query
+}
+
+
+def wikipedia_query_for(claim):
+    """
+    Returns the Wikipedia query verify_structured_claim will make
+    first for this claim, or None if it needs none (or cannot be
+    known before Wikidata answers).
+    """
+
+    query_for = WIKIPEDIA_QUERIES.get(
+        claim["relation"],
+        lambda claim: claim["subject"]
+    )
+
+    return query_for(claim)
+
+
+def prefetch_structured_claims(claims):
+    """
+    Resolves the Wikidata lookups of a whole batch of structured
+    claims up front, so verify_structured_claim hits warm caches.
+    Returns the Wikipedia queries the claims will need, for
+    batching with query_wikipedia_summaries.
+    """
+
+    claims = [
+        claim
+        for claim in claims
+        if claim.get("type") == "structured"
+    ]
+
+    lookups = []
+
+    for claim in claims:
+
+        # P36 = capital
+        if claim["relation"] == "capital_of":
+            lookups.append((claim["object"], "P36"))
+
+        # P20 = place of death
+        elif claim["relation"] == "died_in":
+            lookups.append((build_relation_query(claim), "P20"))
+
+    if lookups:
+        prefetch_claim_targets(lookups)
+
+    queries = [wikipedia_query_for(claim) for claim in claims]
+
+    return [query for query in queries if query]
+
+
 def verify_structured_claim(claim):
     """
     Verifies structured claims using:
@@ -51,6 +141,7 @@ def verify_structured_claim(claim):
 
         if capital:
 
+            # Same query as WIKIPEDIA_QUERIES["capital_of"]
             wiki = query_wikipedia_summary(capital)
 
             if (
@@ -115,9 +206,7 @@ def verify_structured_claim(claim):
         # WIKIPEDIA FALLBACK
         # ------------------------------------------
 
-        query = f"{claim['subject']} {claim['object']}"
-
-        wiki = query_wikipedia_summary(query)
+        wiki = query_wikipedia_summary(wikipedia_query_for(claim))
 
         if not wiki:
             return "Unverifiable", []
@@ -143,8 +232,7 @@ def verify_structured_claim(claim):
     # ==========================================
     elif relation == "located_in":
 
-        query = build_relation_query(claim)
-        wiki = query_wikipedia_summary(query)
+        wiki = query_wikipedia_summary(wikipedia_query_for(claim))
 
         if not wiki:
             return "Unverifiable", []
@@ -172,9 +260,7 @@ def verify_structured_claim(claim):
     # ==========================================
     elif relation == "born_in":
 
-        query = build_relation_query(claim)
-
-        wiki = query_wikipedia_summary(query)
+        wiki = query_wikipedia_summary(wikipedia_query_for(claim))
 
         if not wiki:
             return "Unverifiable", []
@@ -276,9 +362,7 @@ def verify_structured_claim(claim):
     # ==========================================
     elif relation == "nationality":
 
-        query = build_relation_query(claim)
-
-        wiki = query_wikipedia_summary(query)
+        wiki = query_wikipedia_summary(wikipedia_query_for(claim))
 
         if not wiki:
             return "Unverifiable", []
@@ -306,8 +390,7 @@ def verify_structured_claim(claim):
     # ==========================================
     elif relation == "occupation":
 
-        query = build_relation_query(claim)
-        wiki = query_wikipedia_summary(query)
+        wiki = query_wikipedia_summary(wikipedia_query_for(claim))
 
         if not wiki:
             return "Unverifiable", []
@@ -336,8 +419,7 @@ def verify_structured_claim(claim):
     # ==========================================
     elif relation == "invented_by":
 
-        query = build_relation_query(claim)
-        wiki = query_wikipedia_summary(query)
+        wiki = query_wikipedia_summary(wikipedia_query_for(claim))
 
         if not wiki:
             return "Unverifiable", []
@@ -495,9 +577,7 @@ def verify_structured_claim(claim):
     # ==========================================
     elif relation == "is_a":
 
-        query = build_relation_query(claim)
-
-        wiki = query_wikipedia_summary(query)
+        wiki = query_wikipedia_summary(wikipedia_query_for(claim))
 
         if not wiki:
             return "Unverifiable", []
@@ -527,8 +607,7 @@ def verify_structured_claim(claim):
     # ==========================================
     else:
 
-        query = claim["subject"]
-        wiki = query_wikipedia_summary(query)
+        wiki = query_wikipedia_summary(wikipedia_query_for(claim))
 
         if wiki:
             return "Partially true", [wiki]
@@ -0,0 +1,95 @@
+import json
+import os
+import sqlite3
+import threading
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+# Properties kept by build_wikidata_store.py
+STORE_PROPERTIES = [
+    "P36",    # capital
+    "P19",    # place of birth
+    "P20",    # place of death
+    "P27",    # country of citizenship
+    "P106",   # occupation
+    "P569",   # date of birth
+    "P570",   # date of death
+    "P2046",  # area
+    "P2044"   # elevation above sea level
+]
+
+# Bytes of the store file to memory-map per connection.
+MMAP_SIZE = 1 << 30
+
+
+def normalize_name(name):
+
+    return " ".join(str(name).split()).lower()
+
+
+class WikidataStore:
+    """
+    Read-only offline Wikidata subset built by build_wikidata_store.py.
+
+    The SQLite file is opened immutable and memory-mapped, so worker
+    processes share its pages through the OS page cache.
+    """
+
+    def __init__(self, path):
+
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+
+        self.path = os.path.abspath(path)
+        self._local = threading.local()
+
+    def _connection(self):
+
+        conn = getattr(self._local, "conn", None)
+
+        if conn is None:
+
+            conn = sqlite3.connect(
+                f"file:{self.path}?mode=ro&immutable=1",
+                uri=True,
+                check_same_thread=False
+            )
+            conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+
+            self._local.conn = conn
+
+        return conn
+
+    def search(self, name):
+        """
+        Returns the best entity id whose English label or alias
+        equals name (labels first, then most sitelinks), or None.
+        """
+
+        row = self._connection().execute(
+            "SELECT id FROM names WHERE name = ? ORDER BY rank, popularity DESC LIMIT 1",
+            (normalize_name(name),)
+        ).fetchone()
+
+        return row[0] if row else None
+
+    def entity(self, entity_id):
+        """
+        Returns the compact {"id", "label", "claims"} record, or None.
+        """
+
+        row = self._connection().execute(
+            "SELECT record FROM entities WHERE id = ?",
+            (entity_id,)
+        ).fetchone()
+
+        return json.loads(row[0]) if row else None
+
+    def entities(self, entity_ids):
+
+        return {
+            entity_id: record
+            for entity_id in entity_ids
+            if (record := self.entity(entity_id)) is not None
+        }
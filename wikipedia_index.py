@@ -0,0 +1,172 @@
+import os
+import re
+import sqlite3
+import threading
+
+# Bytes of the index file to memory-map per connection.
+MMAP_SIZE = 1 << 30
+
+# bm25 column weights: (title, abstract)
+TITLE_WEIGHT = 10.0
+ABSTRACT_WEIGHT = 1.0
+
+# Dropped from search queries: they match nearly every abstract
+STOP_WORDS = frozenset([
+    "a", "an", "the", "is", "are", "was", "were", "be", "been", "of",
+    "in", "on", "at", "to", "for", "from", "by", "with", "and", "or",
+    "not", "no", "it", "its", "this", "that", "as", "has", "have",
+    "had", "do", "does", "did", "can", "will", "than", "then"
+])
+
+
+def title_key(title):
+    """
+    Exact-lookup key. Wikipedia titles are case-sensitive after the
+    first character ("Red Meat" and "Red meat" are different pages).
+    """
+
+    title = " ".join(str(title).replace("_", " ").split())
+
+    return title[:1].upper() + title[1:]
+
+
+def fold_key(title):
+    """
+    Case-insensitive key, for the fallback lookup.
+    """
+
+    return title_key(title).lower()
+
+
+def fts_query(text):
+    """
+    Builds a safe FTS5 query from free text: every word except stop
+    words is quoted, and all of them must match.
+    """
+
+    words = [
+        word
+        for word in re.findall(r"\w+", text.lower())
+        if word not in STOP_WORDS
+    ]
+
+    return " AND ".join(f'"{word}"' for word in words)
+
+
+class WikipediaIndex:
+    """
+    Read-only local abstract index built by build_wikipedia_index.py.
+
+    Exact title lookup with redirect resolution, plus ranked
+    full-text search (SQLite FTS5, bm25) for non-title queries.
+    """
+
+    def __init__(self, path):
+
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+
+        self.path = os.path.abspath(path)
+        self._local = threading.local()
+
+    def _connection(self):
+
+        conn = getattr(self._local, "conn", None)
+
+        if conn is None:
+
+            conn = sqlite3.connect(
+                f"file:{self.path}?mode=ro&immutable=1",
+                uri=True,
+                check_same_thread=False
+            )
+            conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+
+            self._local.conn = conn
+
+        return conn
+
+    @staticmethod
+    def _record(row):
+
+        title, url, abstract = row
+
+        return {
+            "title": title,
+            "text": abstract,
+            "source": "Wikipedia",
+            "url": url
+        }
+
+    def lookup(self, title):
+        """
+        Exact title match (first letter case-insensitive), following
+        one redirect; failing that, the same ignoring case, first
+        page in dump order.
+        """
+
+        conn = self._connection()
+
+        for page_column, redirect_column, key in [
+            ("title_key", "from_key", title_key(title)),
+            ("fold_key", "from_fold", fold_key(title))
+        ]:
+
+            row = conn.execute(
+                f"SELECT to_title FROM redirects WHERE {redirect_column} = ? LIMIT 1",
+                (key,)
+            ).fetchone()
+
+            keys = [("title_key", title_key(row[0]))] if row else []
+            keys.append((page_column, key))
+
+            for column, value in keys:
+
+                row = conn.execute(
+                    f"SELECT title, url, abstract FROM pages WHERE {column} = ?"
+                    " ORDER BY id LIMIT 1",
+                    (value,)
+                ).fetchone()
+
+                if row:
+                    return self._record(row)
+
+        return None
+
+    def search(self, query, limit=5):
+        """
+        Ranked keyword search. Every non-stop word must match: a page
+        sharing only some words is usually about something else, and
+        no evidence is better than unrelated evidence.
+        """
+
+        match = fts_query(query)
+
+        if not match:
+            return []
+
+        rows = self._connection().execute(
+            "SELECT pages.title, pages.url, pages.abstract"
+            " FROM pages_fts JOIN pages ON pages.id = pages_fts.rowid"
+            " WHERE pages_fts MATCH ?"
+            f" ORDER BY bm25(pages_fts, {TITLE_WEIGHT}, {ABSTRACT_WEIGHT})"
+            " LIMIT ?",
+            (match, limit)
+        ).fetchall()
+
+        return [self._record(row) for row in rows]
+
+    def summary(self, query):
+        """
+        Drop-in for query_wikipedia_summary: the page titled query,
+        else the best search hit, else None.
+        """
+
+        record = self.lookup(query)
+
+        if record:
+            return record
+
+        hits = self.search(query, limit=1)
+
+        return hits[0] if hits else None